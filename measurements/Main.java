@@ -32,6 +32,7 @@ import measurements.support.zipfian.ScrambledZipfianGenerator;
 
 import java.io.FileOutputStream;
 import java.io.IOException;
+import java.io.OutputStream;
 import java.io.PrintStream;
 import java.lang.management.GarbageCollectorMXBean;
 import java.lang.management.ManagementFactory;
@@ -57,6 +58,10 @@ public class Main {
     protected Integer setParam;
     protected Integer retryParam;
     protected boolean isSplit;
+    protected int[] sizeThreadsList;
+    protected int discardedTrials;
+    // number of per-thread columns in the output, the largest thread count of the size threads sweep
+    protected int outputThreads;
 
     // some timing variables
     protected AtomicLong startUserTime = new AtomicLong(0);
@@ -66,7 +71,7 @@ public class Main {
 
 
     public Main(int nthreads, int numOfSizeWorkers, int ntrials, double nseconds, int sizeDelay, String filename,
-            PercentageRatio workloadRatio, String alg, int initSize, boolean prefill, Integer setParam, Integer retryParam, boolean isSplit, boolean useZipfian, double  zipfianTheta)  {
+            PercentageRatio workloadRatio, String alg, int initSize, boolean prefill, Integer setParam, Integer retryParam, boolean isSplit, boolean useZipfian, double  zipfianTheta, int[] sizeThreadsList, int discardedTrials)  {
         this.nthreads = nthreads;
         this.numOfSizeWorkers = numOfSizeWorkers;
         this.ntrials = ntrials;
@@ -82,6 +87,8 @@ public class Main {
         this.isSplit = isSplit;
         this.useZipfian = useZipfian;
         this.zipfianTheta = zipfianTheta;
+        this.sizeThreadsList = sizeThreadsList;
+        this.discardedTrials = discardedTrials;
     }
 
     public static void invokeRun(String[] args) {
@@ -106,6 +113,8 @@ public class Main {
             System.out.println("\t-del%     to specify what % (0 to 100) of ops should be deletes");
             System.out.println("\t-initSizeN    the set will be initialized with N elements");
             System.out.println("\t-split  to split time counting per operation type");
+            System.out.println("\t-sizeThreadsList=N,M,...  to repeat the experiment for each number of size threads in one JVM");
+            System.out.println("\t-discardWarmup-N  to run but not output the first N (warmup) trials of each experiment");
             System.exit(-1);
         }
         int numOfWorkloadWorkers = 0;
@@ -124,6 +133,8 @@ public class Main {
         boolean isSplit = false;
         boolean useZipfian = false;
         double zipfianTheta = 0.99;
+        int[] sizeThreadsList = null;
+        int discardedTrials = 0;
 
         try {
             numOfWorkloadWorkers = Integer.parseInt(args[0]);
@@ -213,6 +224,32 @@ public class Main {
                         System.out.println("ERROR: The retry parameter must be a 32-bit integer.");
                         System.exit(-1);
                     }
+                } else if (arg.startsWith("-sizeThreadsList=")) {
+                    try {
+                        String[] counts = arg.substring("-sizeThreadsList=".length()).split(",");
+                        sizeThreadsList = new int[counts.length];
+                        for (int i = 0; i < counts.length; i++) {
+                            sizeThreadsList[i] = Integer.parseInt(counts[i]);
+                            if (sizeThreadsList[i] < 0) {
+                                System.out.println("ERROR: Number of size threads must be >= 0");
+                                System.exit(-1);
+                            }
+                        }
+                    } catch (NumberFormatException ex) {
+                        System.out.println("ERROR: The size threads list must be comma-separated 32-bit integers.");
+                        System.exit(-1);
+                    }
+                } else if (arg.startsWith("-discardWarmup-")) {
+                    try {
+                        discardedTrials = Integer.parseInt(arg.substring("-discardWarmup-".length()));
+                        if (discardedTrials < 0) {
+                            System.out.println("ERROR: The number of discarded warmup trials must be >= 0");
+                            System.exit(-1);
+                        }
+                    } catch (NumberFormatException ex) {
+                        System.out.println("ERROR: The number of discarded warmup trials must be a 32-bit integer.");
+                        System.exit(-1);
+                    }
                 } else if (arg.startsWith("-file-")) {
                     filename = arg.substring("-file-".length());
                 } else if (arg.matches("-prefill")) {
@@ -256,7 +293,7 @@ public class Main {
         // }
         (new Main(numOfWorkloadWorkers + numOfSizeWorkers, numOfSizeWorkers, ntrials, nseconds, sizeDelay, filename,
                 new PercentageRatio(insPercent, remPercent, 0),
-                alg, initSize, prefill, setParam, retryParam, isSplit, useZipfian, zipfianTheta)).run();
+                alg, initSize, prefill, setParam, retryParam, isSplit, useZipfian, zipfianTheta, sizeThreadsList, discardedTrials)).run();
     }
 
     public static void main(String[] args) throws Exception {
@@ -418,41 +455,52 @@ public class Main {
         out.print("," + sizeDelay);
         out.print("," + totalThreadTime);
 
+        // empty fields pad each per-thread group to the header's thread count, keeping the columns aligned
+        final String missingThreads = ",".repeat(outputThreads - nthreads);
+        final String missingThreadPairs = missingThreads + missingThreads;
+
         for (Worker w : workers) {
             long ops = w.getTrueIns() + w.getFalseIns() + w.getTrueDel() + w.getFalseDel() + w.getTrueFind() +
                     w.getFalseFind() + w.getDoneSize();
             out.print("," + ops);
         }
+        out.print(missingThreads);
 
         // user start+end times per thread
         for (Worker w : workers) {
             out.print("," + ((w.getMyStartUserTime() - minStartUserTime) / 1e9) + "," + ((w.getUserTime() - minStartUserTime) / 1e9));
         }
+        out.print(missingThreadPairs);
 
         // wall start+end times per thread
         for (Worker w : workers) {
             out.print("," + ((w.getMyStartWallTime() - minStartWallTime) / 1e9) + "," + ((w.getWallTime() - minStartWallTime) / 1e9));
         }
+        out.print(missingThreadPairs);
 
         // CPU start+end times per thread
         for (Worker w : workers) {
             out.print("," + ((w.getMyStartCPUTime() - minStartCPUTime) / 1e9) + "," + ((w.getCPUTime() - minStartCPUTime) / 1e9));
         }
+        out.print(missingThreadPairs);
 
         // ins time per thread
         for (Worker w : workers) {
             out.print("," + (w.getInsTime() / 1e9));
         }
+        out.print(missingThreads);
 
         // del time per thread
         for (Worker w : workers) {
             out.print("," + (w.getDelTime() / 1e9));
         }
+        out.print(missingThreads);
 
         // contains time per thread
         for (Worker w : workers) {
             out.print("," + (w.getContainsTime() / 1e9));
         }
+        out.print(missingThreads);
 
         out.println(); // finished line of output
         ThreadID.deregister();
@@ -540,6 +588,12 @@ public class Main {
             System.exit(-1);
         }
 
+        // with a size threads list, every count is measured in turn in this JVM
+        final int numOfWorkloadWorkers = nthreads - numOfSizeWorkers;
+        final int[] sizeWorkerCounts = sizeThreadsList == null ? new int[]{numOfSizeWorkers} : sizeThreadsList;
+        outputThreads = 0;
+        for (int count : sizeWorkerCounts) outputThreads = Math.max(outputThreads, numOfWorkloadWorkers + count);
+
         // print header
         out.print("name"
                 + ",trial"
@@ -571,50 +625,68 @@ public class Main {
         out.print(",nseconds");
         out.print(",sizeDelay");
         out.print(",effectivetimeperthread");
-        for (int i = 0; i < nthreads; i++) out.print(",thread" + i + "ops");
-        for (int i = 0; i < nthreads; i++) out.print(",thread" + i + "userstart" + ",thread" + i + "userend");
-        for (int i = 0; i < nthreads; i++) out.print(",thread" + i + "wallstart" + ",thread" + i + "wallend");
-        for (int i = 0; i < nthreads; i++) out.print(",thread" + i + "cpustart" + ",thread" + i + "cpuend");
-        for (int i = 0; i < nthreads; i++) out.print(",thread" + i + "instime");
-        for (int i = 0; i < nthreads; i++) out.print(",thread" + i + "deltime");
-        for (int i = 0; i < nthreads; i++) out.print(",thread" + i + "containstime");
+        for (int i = 0; i < outputThreads; i++) out.print(",thread" + i + "ops");
+        for (int i = 0; i < outputThreads; i++) out.print(",thread" + i + "userstart" + ",thread" + i + "userend");
+        for (int i = 0; i < outputThreads; i++) out.print(",thread" + i + "wallstart" + ",thread" + i + "wallend");
+        for (int i = 0; i < outputThreads; i++) out.print(",thread" + i + "cpustart" + ",thread" + i + "cpuend");
+        for (int i = 0; i < outputThreads; i++) out.print(",thread" + i + "instime");
+        for (int i = 0; i < outputThreads; i++) out.print(",thread" + i + "deltime");
+        for (int i = 0; i < outputThreads; i++) out.print(",thread" + i + "containstime");
         out.println();
 
         // retrieve list of experiments to perform
         ArrayList<Experiment> exp = getExperiments();
 
+        // warmup trials still run, but their rows are not written when they are discarded
+        final PrintStream warmupOut = discardedTrials > 0 ? new PrintStream(OutputStream.nullOutputStream()) : out;
+
         // perform the experiment
-        Random rng = new Random((int) System.nanoTime()); // produce a seed from current time
-        for (Experiment ex : exp) {
-            int experimentSeed = rng.nextInt();
-            java.util.Random experimentRng = new java.util.Random(experimentSeed);
-
-            // find appropriate factory to produce the set we want for this trial
-            // and run the trial
-            for (SetFactory<Integer> factory : Factories.factories)
-                if (ex.alg.equals(factory.getName())) {
-                    stdout.println("Running " + ex);
-                    for (int trial = 0; trial < ntrials; ++trial) {
-                        stdout.print(".");
-                        Camera.camera.timestamp = 0;
-                        System.gc();
-                        SetInterface<Integer> set = factory.newSet(ex.param,retryParam);
-                        SizeKeysumPair p = new SizeKeysumPair(0, 0);
-                        if (prefill) {
-                            p = parallelFillToSteadyState(experimentRng, set, ex.initSize, ex.maxKey);
-                        }
-                        String name = factory.getName();
-                        if (name.contains("Batch") && ex.param != null) {
-                            name += ex.param;
-                        }
-                        if (name.contains("Optimistic") && ex.retryParam != null) {
-                            name += "-Retry"+ex.retryParam;
+        for (int countIndex = 0; countIndex < sizeWorkerCounts.length; countIndex++) {
+            if (countIndex > 0) {
+                // let the previous configuration's threads and garbage settle before the next one
+                System.gc();
+                try {
+                    Thread.sleep(1000);
+                } catch (InterruptedException e) {
+                    e.printStackTrace();
+                    System.exit(-1);
+                }
+            }
+            numOfSizeWorkers = sizeWorkerCounts[countIndex];
+            nthreads = numOfWorkloadWorkers + numOfSizeWorkers;
+
+            Random rng = new Random((int) System.nanoTime()); // produce a seed from current time
+            for (Experiment ex : exp) {
+                int experimentSeed = rng.nextInt();
+                java.util.Random experimentRng = new java.util.Random(experimentSeed);
+
+                // find appropriate factory to produce the set we want for this trial
+                // and run the trial
+                for (SetFactory<Integer> factory : Factories.factories)
+                    if (ex.alg.equals(factory.getName())) {
+                        stdout.println("Running " + ex);
+                        for (int trial = 0; trial < ntrials; ++trial) {
+                            stdout.print(".");
+                            Camera.camera.timestamp = 0;
+                            System.gc();
+                            SetInterface<Integer> set = factory.newSet(ex.param,retryParam);
+                            SizeKeysumPair p = new SizeKeysumPair(0, 0);
+                            if (prefill) {
+                                p = parallelFillToSteadyState(experimentRng, set, ex.initSize, ex.maxKey);
+                            }
+                            String name = factory.getName();
+                            if (name.contains("Batch") && ex.param != null) {
+                                name += ex.param;
+                            }
+                            if (name.contains("Optimistic") && ex.retryParam != null) {
+                                name += "-Retry"+ex.retryParam;
+                            }
+                            if (!runTrial(trial < discardedTrials ? warmupOut : out, name + "," + trial, p, experimentRng, (AbstractAdapter<Integer>) set, ex, isSplit))
+                                System.exit(-1);
                         }
-                        if (!runTrial(out, name + "," + trial, p, experimentRng, (AbstractAdapter<Integer>) set, ex, isSplit))
-                            System.exit(-1);
+                        stdout.println("");
                     }
-                    stdout.println("");
-                }
+            }
         }
     }
 
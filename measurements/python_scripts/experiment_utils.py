@@ -1,28 +1,103 @@
 """Common helper functions for measurement scripts."""
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 import os
+import queue
+import re
+import shutil
+import subprocess
 
-def clear_previous_results():
-    """Remove any CSV results from a previous run."""
-    for pattern in ("build/*.csv", "build/*.csv_stdout"):
-        for file in Path().glob(pattern):
-            file.unlink()
+import experiments_environment as env
 
-def concat_results(output_path: Path):
-    """Concatenate per-run CSV files into ``output_path``."""
+# Chunk size used when streaming trial CSVs into the united results file
+COPY_BUFFER_SIZE = 1 << 20
+
+# Graph directories known to exist, so that repeated calls skip the filesystem
+_created_graph_dirs = set()
+
+def clear_previous_results(directory="build"):
+    """Remove the per-run ``data-*.csv`` files of a previous run (and their stdout logs) from ``directory``."""
+    if not os.path.isdir(directory):
+        return
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if (entry.name.startswith("data-") and entry.name.endswith((".csv", ".csv_stdout"))
+                    and entry.is_file(follow_symlinks=False)):
+                os.unlink(entry.path)
+
+def _run_number(csv_file: Path):
+    """Sort key putting ``data-trials2.csv`` before ``data-trials10.csv``."""
+    match = re.search(r"\d+", csv_file.stem)
+    return (int(match.group()) if match else 0, csv_file.name)
+
+def concat_results(output_path: Path, source_dir: Path = Path("build")):
+    """Concatenate the per-run CSV files of ``source_dir`` into ``output_path`` in run order.
+
+    A file's header is written only when it differs from the previous one. The per-thread
+    columns depend on each run's thread count, so every block of rows keeps the header that
+    matches its layout, while runs with the same layout share one header. The files are copied
+    as raw bytes; only their first line is read separately.
+    """
     output_path.parent.mkdir(parents=True, exist_ok=True)
+    last_header = None
     with output_path.open("wb") as out:
-        for csv_file in sorted(Path("build").glob("data-*.csv")):
-            out.write(csv_file.read_bytes())
+        for csv_file in sorted(source_dir.glob("data-*.csv"), key=_run_number):
+            with csv_file.open("rb") as src:
+                header = src.readline()
+                if header != last_header:
+                    out.write(header)
+                    last_header = header
+                shutil.copyfileobj(src, out, COPY_BUFFER_SIZE)
+
+def ensure_graph_dirs():
+    """Create the graph directory and one subdirectory per baseline data structure if missing."""
+    graph_root = Path(env.GRAPH_DIR)
+    for graph_dir in [graph_root] + [graph_root / alg for alg in env.baselineDataStructures]:
+        if graph_dir not in _created_graph_dirs:
+            # A single mkdir call, which fails harmlessly when the directory exists
+            graph_dir.mkdir(parents=True, exist_ok=True)
+            _created_graph_dirs.add(graph_dir)
+
+def cpu_slots(jobs: int):
+    """Split the CPUs this process may run on into ``jobs`` disjoint comma-separated lists."""
+    cpus = sorted(os.sched_getaffinity(0))
+    jobs = max(1, min(jobs, len(cpus)))
+    return [",".join(str(cpu) for cpu in cpus[slot::jobs]) for slot in range(jobs)]
+
+def run_commands(cmds, jobs: int = 1, cpu_pin: bool = False, shell: bool = False) -> bool:
+    """Run the benchmark commands, ``jobs`` at a time; return False if any failed.
+
+    With a single job the commands run in order and stop at the first failure.
+    With ``cpu_pin`` every concurrent run is wrapped in ``taskset`` with its own
+    set of cores. ``shell`` runs command strings through ``/bin/sh``.
+    """
+    if jobs <= 1:
+        return all(subprocess.run(cmd, shell=shell).returncode == 0 for cmd in cmds)
+
+    free_slots = queue.Queue()
+    for slot in cpu_slots(jobs) if cpu_pin else [None] * jobs:
+        free_slots.put(slot)
+
+    def run(cmd):
+        slot = free_slots.get()
+        try:
+            if slot is not None:
+                cmd = f"taskset -c {slot} {cmd}" if shell else ["taskset", "-c", slot] + cmd
+            return subprocess.run(cmd, shell=shell).returncode
+        finally:
+            free_slots.put(slot)
+
+    with ThreadPoolExecutor(max_workers=free_slots.qsize()) as executor:
+        futures = [executor.submit(run, cmd) for cmd in cmds]
+        return all([future.result() == 0 for future in as_completed(futures)])
 
 def java_cmd(memory_size: str):
-    """Return the Java command prefix with the requested memory size."""
-    base = (
-        "java -server -XX:-RestrictContended -XX:ContendedPaddingWidth=64 "
-        f"-Xms{memory_size} -Xmx{memory_size} -jar build/experiments_instr.jar "
-    )
-    return base
+    """Return the Java argv prefix with the requested memory size."""
+    return [
+        "java", "-server", "-XX:-RestrictContended", "-XX:ContendedPaddingWidth=64",
+        f"-Xms{memory_size}", f"-Xmx{memory_size}", "-jar", "build/experiments_instr.jar",
+    ]
 
 def parse_int_list(value: str):
     """Return a list of integers parsed from a comma-separated string."""
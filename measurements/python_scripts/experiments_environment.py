@@ -5,6 +5,8 @@ DATA_DIR = "results"
 
 # Baseline sequential implementations used for comparison
 baselineDataStructures = ["HashTable", "BST", "SkipList"]
+# Same names for membership tests
+baselineDataStructuresSet = frozenset(baselineDataStructures)
 
 # All data-structure variants evaluated in the paper
 dataStructures = [
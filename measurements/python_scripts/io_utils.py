@@ -3,13 +3,20 @@
 import csv
 import os
 import logging
-import statistics as st
-from typing import Dict, List
+from typing import Dict, List, NamedTuple, Tuple
 import enum
+import functools
+import io
+import numbers
+import operator
+import numpy as np
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - \033[96m%(levelname)s\033[0m - %(message)s')
 
+# Read buffer for results files, large enough that a united file takes only a few read calls
+READ_BUFFER_SIZE = 1 << 20
+
 class WorkloadOpType(enum.Enum):
     """Operation types recorded in the CSV results."""
     all = -1.5
@@ -19,7 +26,7 @@ class WorkloadOpType(enum.Enum):
 
 # CSV column order produced by the Java benchmarks
 columns = [
-    "name", "nWorkloadThreads", "nSizeThreads", "percentageRatio", "initSize", 
+    "name", "trial", "nWorkloadThreads", "nSizeThreads", "percentageRatio", "initSize", 
     "time", "workloadThreadsThroughput", "sizeThreadsThroughput", 
     "ninstrue", "ninsfalse", "ndeltrue", "ndelfalse", "ncontainstrue", "ncontainsfalse", 
     "totalelapsedinstime", "totalelapseddeltime", "totalelapsedcontainstime",
@@ -36,96 +43,177 @@ def flatten(l: List[List[str]]) -> List[str]:
     """Return a flattened copy of a list of lists."""
     return [item for sublist in l for item in sublist]
 
+# Lookup tables derived from sizeDataStrucutres
+sizeAlgorithms = frozenset(flatten(sizeDataStrucutres.values()))
+baselineOfSizeAlg = {sizeAlg: baseline for baseline, sizeAlgs in sizeDataStrucutres.items() for sizeAlg in sizeAlgs}
+
+@functools.lru_cache(maxsize=512)
 def isSizeAlgorithm(alg: str) -> bool:
     """Return True if ``alg`` is a size-aware data structure."""
-    alg = alg.split("-")[0]
-    return alg in flatten(sizeDataStrucutres.values())
+    return alg.split("-", 1)[0] in sizeAlgorithms
 
 def getBaselineAlg(sizeAlg: str):
     """Return the baseline algorithm for ``sizeAlg`` if any."""
-    if not isSizeAlgorithm(sizeAlg):
-        return None
-    for key, value in sizeDataStrucutres.items():
-        if sizeAlg in value:
-            return key
-    return None
+    return baselineOfSizeAlg.get(sizeAlg)
+
+@functools.lru_cache(maxsize=32)
+def getAlgsByBaseline(algs: tuple, excludeWideRetries: bool = False) -> Dict[str, List[str]]:
+    """Map each baseline to the algorithms of ``algs`` whose names contain it, shortest names first.
 
+    Used by the retry graphs, where e.g. ``OptimisticSizeBST-Retry4`` belongs to ``BST``; with
+    ``excludeWideRetries``, names containing 32 or 64 are left out. The lists are shared between
+    callers and must be copied before being modified.
+    """
+    algsByBaseline = {baselineAlg: [] for baselineAlg in sizeDataStrucutres}
+    for alg in sorted(algs, key=lambda x: (len(x), x)):
+        if excludeWideRetries and ("32" in alg or "64" in alg):
+            continue
+        for baselineAlg, baselineAlgs in algsByBaseline.items():
+            if baselineAlg in alg:
+                baselineAlgs.append(alg)
+    return algsByBaseline
+
+@functools.lru_cache(maxsize=4096, typed=True)
 def toString(algname: str, workloadThreadsNum: int, sizeThreadsNum: int, 
             initSize: int, percentageRatio: str) -> str:
-    """Return a key string for lookup dictionaries."""
+    """Return a key string for lookup dictionaries.
+
+    Cached, since the plotting code rebuilds the same keys in its nested loops; ``typed`` keeps
+    e.g. ``4`` and ``4.0`` apart, as they format differently.
+    """
     return f"{algname}-{workloadThreadsNum}w-{sizeThreadsNum}s-{initSize}k-{percentageRatio}"
 
+def toStringBatch(algname: str, workloadThreadsNums, sizeThreadsNums, initSize: int,
+                  percentageRatio: str) -> List[str]:
+    """Return the ``toString`` keys for several thread counts at once.
+
+    Exactly one of the thread arguments is a list of counts; the other is a single count used in every
+    key. The parts shared by all keys are formatted only once.
+    """
+    suffix = f"s-{initSize}k-{percentageRatio}"
+    if isinstance(workloadThreadsNums, numbers.Integral):
+        prefix = f"{algname}-{workloadThreadsNums}w-"
+        return [f"{prefix}{sizeThreadsNum}{suffix}" for sizeThreadsNum in sizeThreadsNums]
+    suffix = f"w-{sizeThreadsNums}{suffix}"
+    return [f"{algname}-{workloadThreadsNum}{suffix}" for workloadThreadsNum in workloadThreadsNums]
+
 def toStringSplit(algname: str, workloadThreadsNum: int, sizeThreadsNum: int, 
                  initSize: int, percentageRatio: str, workloadOpType: WorkloadOpType) -> str:
     """Return a key including the workload operation type."""
     return toString(algname, workloadThreadsNum, sizeThreadsNum, initSize, percentageRatio) + f"r-{workloadOpType.name}"
 
-def avg(numlist: List[float]) -> float:
-    """Return the arithmetic mean of ``numlist`` or ``-1`` if empty."""
-    return sum(float(num) for num in numlist) / len(numlist) if numlist else -1
-
 def read_java_results_file(path: str, results: Dict[str, float], stddev: Dict[str, float], 
                          workloadThreads: List[int], sizeThreads: List[int], ratios: List[str], 
                          initSizes: List[int], algs: List[str], warmupRepeats: int, 
                          isWorkloadThreadsTP: bool, isSplitByOpType: bool = False) -> None:
     """Parse ``path`` and populate the provided result containers."""
-    columnIndex = {}
     resultsRaw = {}
 
     # read csv into resultsRaw
     try:
-        with open(path, newline='') as csvfile:
+        # Results are plain ASCII, which decodes more cheaply than the default UTF-8
+        with open(path, 'rb', buffering=READ_BUFFER_SIZE) as rawfile, \
+                io.TextIOWrapper(rawfile, encoding='ascii', newline='') as csvfile:
             csvreader = csv.reader(csvfile, delimiter=',', quotechar='|')
-            for row in csvreader:
-                if not bool(columnIndex):  # columnIndex dictionary is empty
-                    for col in columns:
-                        columnIndex[col] = row.index(col)
-                if row[columnIndex[columns[0]]] == columns[0]:  # row contains column titles
-                    continue
-                values = {}
-                for col in columns:
-                    values[col] = row[columnIndex[col]]
-                if int(values['nWorkloadThreads']) not in workloadThreads:
-                    workloadThreads.append(int(values['nWorkloadThreads']))
-                if isSizeAlgorithm(values['name']) and int(values['nSizeThreads']) not in sizeThreads:
-                    sizeThreads.append(int(values['nSizeThreads']))
-                if int(values['initSize']) not in initSizes:
-                    initSizes.append(int(values['initSize']))
-                if values['percentageRatio'] not in ratios:
-                    ratios.append(values['percentageRatio'])
-                if values['name'] not in algs:
-                    algs.append(values['name'])
-                time = float(values['time'])
+            header = next(csvreader, None)
+            if header is None:
+                logging.error(f"Error processing {path}: file is empty")
+                return
+            # Column positions are looked up once; the fixed columns precede the per-thread ones,
+            # so they are identical in every concatenated block
+            columnIndex = {col: header.index(col) for col in columns}
+            (iName, iTrial, iWorkloadThreads, iSizeThreads, iRatio, iInitSize, iTime, iWorkloadThreadsTP, iSizeThreadsTP,
+             iInsTrue, iInsFalse, iDelTrue, iDelFalse, iContainsTrue, iContainsFalse,
+             iInsTime, iDelTime, iContainsTime) = (columnIndex[col] for col in columns)
+            # Sets mirror the output lists so that each membership test is O(1)
+            workloadThreadsSeen = set(workloadThreads)
+            sizeThreadsSeen = set(sizeThreads)
+            initSizesSeen = set(initSizes)
+            ratiosSeen = set(ratios)
+            algsSeen = set(algs)
+            # Sample lists in resultsRaw by key parts, so that the key of a benchmark is formatted only
+            # for its first row (with one list per operation type when splitting by operation type)
+            samplesByKeyParts = {}
+            # Raw per-operation counters of each row, only collected when splitting by operation type
+            splitKeys = []
+            opCounters = []
+            # Throughput column reported when results are not split by operation type
+            iThroughput = iWorkloadThreadsTP if isWorkloadThreadsTP else iSizeThreadsTP
+            # Only the fixed columns are used, so each row is split just past the last of them and
+            # its per-thread columns are left unparsed (the values contain no quotes or commas)
+            maxSplit = max(columnIndex.values()) + 1
+            # concat_results writes a single header, but united files written by older scripts repeat
+            # the header of every trial file; such rows are recognised by their name cell alone
+            headerName = header[iName]
+            # One itemgetter call extracts a row's key fields (in toString's argument order) and another
+            # its operation counters, instead of indexing the row once per column
+            keyFields = operator.itemgetter(iName, iWorkloadThreads, iSizeThreads, iInitSize, iRatio)
+            opCounterFields = operator.itemgetter(iInsTrue, iInsFalse, iDelTrue, iDelFalse,
+                                                  iContainsTrue, iContainsFalse, iInsTime, iDelTime, iContainsTime)
+            # Each run writes all trials of a benchmark one after another, so consecutive rows
+            # usually share their key and only the first row of such a block is looked up
+            lastKeyParts = None
+            samples = None
+            for line in csvfile:
+                row = line.split(',', maxSplit)
+                # Keys are built from the raw column strings, which format exactly like the parsed ints
+                keyParts = keyFields(row)
+                if keyParts != lastKeyParts:
+                    name, workloadThreadsStr, sizeThreadsStr, initSizeStr, ratio = keyParts
+                    if name == headerName:
+                        continue
+                    nWorkloadThreads = int(workloadThreadsStr)
+                    if nWorkloadThreads not in workloadThreadsSeen:
+                        workloadThreadsSeen.add(nWorkloadThreads)
+                        workloadThreads.append(nWorkloadThreads)
+                    nSizeThreads = int(sizeThreadsStr)
+                    if nSizeThreads not in sizeThreadsSeen and isSizeAlgorithm(name):
+                        sizeThreadsSeen.add(nSizeThreads)
+                        sizeThreads.append(nSizeThreads)
+                    initSize = int(initSizeStr)
+                    if initSize not in initSizesSeen:
+                        initSizesSeen.add(initSize)
+                        initSizes.append(initSize)
+                    if ratio not in ratiosSeen:
+                        ratiosSeen.add(ratio)
+                        ratios.append(ratio)
+                    if name not in algsSeen:
+                        algsSeen.add(name)
+                        algs.append(name)
+                    lastKeyParts = keyParts
+
+                    if not isSplitByOpType:
+                        samples = samplesByKeyParts.get(keyParts)
+                        if samples is None:
+                            samples = samplesByKeyParts[keyParts] = resultsRaw.setdefault(toString(*keyParts), [])
 
+                # Warmup trials are recognised by their trial index rather than their position, so files
+                # whose warmup rows were already left out by the benchmark (-discardWarmup) parse the same
+                if int(row[iTrial]) < warmupRepeats:
+                    continue
                 if not isSplitByOpType:
-                    key = toString(values['name'], values['nWorkloadThreads'], values['nSizeThreads'], values['initSize'],
-                                values['percentageRatio'])
-                    if key not in resultsRaw:
-                        resultsRaw[key] = []
-                    if isWorkloadThreadsTP:
-                        resultsRaw[key].append(int(values['workloadThreadsThroughput']))
-                    else:
-                        resultsRaw[key].append(int(values['sizeThreadsThroughput']))
+                    samples.append(int(row[iThroughput]))
                 else:
-                    for workloadOpType in WorkloadOpType:
-                        key = toStringSplit(values['name'], values['nWorkloadThreads'], values['nSizeThreads'],
-                                            values['initSize'], values['percentageRatio'], workloadOpType)
-                        if key not in resultsRaw:
-                            resultsRaw[key] = []
-                        if workloadOpType == WorkloadOpType.all:
-                            resultsRaw[key].append((int(values['ninstrue']) + int(values['ninsfalse']) + int(
-                                values['ndeltrue']) + int(values['ndelfalse']) + int(values['ncontainstrue']) + int(
-                                values['ncontainsfalse'])) / (float(values['totalelapsedinstime']) + float(
-                                values['totalelapseddeltime']) + float(values['totalelapsedcontainstime'])))
-                        elif workloadOpType == WorkloadOpType.insert:
-                            resultsRaw[key].append(
-                                (int(values['ninstrue']) + int(values['ninsfalse'])) / float(values['totalelapsedinstime']))
-                        elif workloadOpType == WorkloadOpType.delete:
-                            resultsRaw[key].append(
-                                (int(values['ndeltrue']) + int(values['ndelfalse'])) / float(values['totalelapseddeltime']))
-                        else:  # workloadOpType == WorkloadOpType.contains
-                            resultsRaw[key].append((int(values['ncontainstrue']) + int(values['ncontainsfalse'])) / float(
-                                values['totalelapsedcontainstime']))
+                    splitKeys.append(keyParts)
+                    opCounters.append(opCounterFields(row))
+
+            if splitKeys:
+                # Per-operation throughputs of all rows at once, one column per WorkloadOpType
+                counters = np.array(opCounters, dtype=np.float64)
+                ops = counters[:, 0:6:2] + counters[:, 1:6:2]  # insert, delete, contains
+                times = counters[:, 6:9]
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    throughputs = np.column_stack((ops.sum(axis=1) / times.sum(axis=1), ops / times))
+                # Same keys as toStringSplit, with the base key formatted once per benchmark
+                opSuffixes = [f"r-{workloadOpType.name}" for workloadOpType in WorkloadOpType]
+                for keyParts, rowThroughputs in zip(splitKeys, throughputs.tolist()):
+                    opSamples = samplesByKeyParts.get(keyParts)
+                    if opSamples is None:
+                        baseKey = toString(*keyParts)
+                        opSamples = samplesByKeyParts[keyParts] = [resultsRaw.setdefault(baseKey + opSuffix, [])
+                                                                   for opSuffix in opSuffixes]
+                    for samples, throughput in zip(opSamples, rowThroughputs):
+                        samples.append(throughput)
     except Exception as e:
         logging.error(f"Error processing {path}: {e}")
         return
@@ -136,20 +224,101 @@ def read_java_results_file(path: str, results: Dict[str, float], stddev: Dict[st
     else:
         divideBy = 1000.0
 
+    # Mean and population stddev (ddof=0) of the samples, which exclude warmup. Benchmarks with the same
+    # number of samples are stacked into one matrix and reduced by a single numpy call.
+    keysBySampleCount = {}
+    for key, values in resultsRaw.items():
+        keysBySampleCount.setdefault(len(values), []).append(key)
+    means = {}
+    stddevs = {}
+    for sampleCount, keys in keysBySampleCount.items():
+        if sampleCount == 0:
+            means.update(dict.fromkeys(keys, -1))
+            stddevs.update(dict.fromkeys(keys, float('nan')))
+            continue
+        samples = np.array([resultsRaw[key] for key in keys], dtype=np.float64)
+        means.update(zip(keys, samples.mean(axis=1).tolist()))
+        stddevs.update(zip(keys, samples.std(axis=1).tolist()))
+
+    statisticsRows = []
+    for key in resultsRaw:
+        results[key] = means[key]
+        stddev[key] = stddevs[key]
+        if results[key] < 1e-8:
+            CV = -1
+        else:
+            CV = stddev[key] / results[key]
+        statisticsRows.append((key, "%.3f" % results[key], "%.3f" % stddev[key], "%.3f" % CV))
+        if not isSplitByOpType:
+            results[key] /= divideBy
+
     with open(os.path.join(os.path.dirname(path), os.path.basename(path)[:-len('.csv')] + '_statistics.csv'), 'w',
               newline='') as statisticsFile:
         writer = csv.writer(statisticsFile)
         writer.writerow(['benchmark', 'meanTP', 'stddev', 'CV'])
-        for key in resultsRaw:
-            resultsAll = resultsRaw[key]
-            resultsExcludingWarmup = resultsAll[warmupRepeats:]
-            results[key] = avg(resultsExcludingWarmup)
-            stddev[key] = st.pstdev(resultsExcludingWarmup)
-            if results[key] < 1e-8:
-                CV = -1
-            else:
-                CV = stddev[key] / results[key]
-            writer.writerow([key, "%.3f" % results[key], "%.3f" % stddev[key], "%.3f" % CV])
-            if not isSplitByOpType:
-                results[key] /= divideBy
+        writer.writerows(statisticsRows)
+
+class ParsedResults(NamedTuple):
+    """Parsed contents of a results file, as filled in by ``read_java_results_file``."""
+    throughput: Dict[str, float]
+    stddev: Dict[str, float]
+    workloadThreads: Tuple[int, ...]
+    sizeThreads: Tuple[int, ...]
+    ratios: Tuple[str, ...]
+    initSizes: Tuple[int, ...]
+    algs: Tuple[str, ...]
+
+@functools.lru_cache(maxsize=32)
+def load_results(path: str, warmupRepeats: int, isWorkloadThreadsTP: bool,
+                 isSplitByOpType: bool = False) -> ParsedResults:
+    """Parse ``path`` once per argument combination and share the result between callers.
+
+    The returned dicts are shared by every caller, so they must not be modified.
+    """
+    results = {}
+    stddev = {}
+    workloadThreads = []
+    sizeThreads = []
+    ratios = []
+    initSizes = []
+    algs = []
+    read_java_results_file(path, results, stddev, workloadThreads, sizeThreads, ratios, initSizes, algs,
+                           warmupRepeats, isWorkloadThreadsTP, isSplitByOpType)
+    return ParsedResults(results, stddev, tuple(workloadThreads), tuple(sizeThreads), tuple(ratios),
+                         tuple(initSizes), tuple(algs))
+
+@functools.lru_cache(maxsize=4096)
+def splitKey(key: str):
+    """Split a ``toString`` key back into (algname, workloadThreadsNum, sizeThreadsNum, initSize, percentageRatio)."""
+    # The ratio itself contains two hyphens ("30i-20d-50f"), while algorithm names may contain one ("-Retry4")
+    algname, workloadThreadsNum, sizeThreadsNum, initSize, *ratioParts = key.rsplit('-', 6)
+    return (algname, int(workloadThreadsNum[:-1]), int(sizeThreadsNum[:-1]), int(initSize[:-1]),
+            '-'.join(ratioParts))
+
+class ResultsArray(NamedTuple):
+    """Mean throughputs indexed [alg, workload threads, size threads, init size, ratio], NaN where not measured.
+
+    Stored as float32, which is ample for plotting and halves the array's size.
+    """
+    throughput: np.ndarray
+    algIndex: Dict[str, int]
+    workloadThreadsIndex: Dict[int, int]
+    sizeThreadsIndex: Dict[int, int]
+    initSizeIndex: Dict[int, int]
+    ratioIndex: Dict[str, int]
 
+@functools.lru_cache(maxsize=32)
+def load_results_array(path: str, warmupRepeats: int, isWorkloadThreadsTP: bool) -> ResultsArray:
+    """Return the throughputs of ``load_results`` as a dense array, for indexed and vectorized access."""
+    throughput = load_results(path, warmupRepeats, isWorkloadThreadsTP).throughput
+    keyParts = [splitKey(key) for key in throughput]
+    # One index per dimension; baselines (0 size threads) are included although sizeThreads lists only size algorithms
+    indexes = [{} for _ in range(5)]
+    for parts in keyParts:
+        for index, part in zip(indexes, parts):
+            index.setdefault(part, len(index))
+    array = np.full([len(index) for index in indexes], np.nan, dtype=np.float32)
+    positions = tuple(np.array([[index[part] for index, part in zip(indexes, parts)] for parts in keyParts],
+                               dtype=np.intp).reshape(-1, 5).T)
+    array[positions] = list(throughput.values())
+    return ResultsArray(array, *indexes)
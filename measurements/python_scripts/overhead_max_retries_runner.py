@@ -4,7 +4,7 @@ from pathlib import Path
 
 import plot_utils as graph
 import experiments_environment as env
-from experiment_utils import clear_previous_results, concat_results, java_cmd, parse_int_list
+from experiment_utils import clear_previous_results, concat_results, ensure_graph_dirs, java_cmd, parse_int_list, run_commands
 
 parser = argparse.ArgumentParser(
     description="Measure overhead while varying optimistic retry counts."
@@ -25,6 +25,12 @@ parser.add_argument("--warmup-runs", type=int, required=True, help="Number of wa
 parser.add_argument("--repeats", type=int, required=True, help="Number of measured repetitions")
 parser.add_argument("--runtime", required=True, help="Benchmark runtime per repetition")
 parser.add_argument("--jvm-mem", required=True, help="JVM memory size (e.g., 1G)")
+parser.add_argument(
+    "--jobs",
+    type=int,
+    default=1,
+    help="Number of benchmark runs to execute concurrently (keep 1 when measuring throughput)",
+)
 # Experiments always run before graphs are drawn
 
 args = parser.parse_args()
@@ -43,45 +49,37 @@ warmup_runs = args.warmup_runs
 total_runs = warmup_runs + args.repeats
 run_time = args.runtime
 jvm_mem = args.jvm_mem
+jobs = args.jobs
 
 def delete_previous_results() -> None:
     clear_previous_results()
 
 def run_experiments() -> None:
     cmd_base = java_cmd(jvm_mem)
+    # Arguments shared by all runs
+    run_args = [str(total_runs), run_time, size_delay]
+    workload_args = [f"-ins{insert_rate}", f"-del{delete_rate}", f"-initSize{init_size}"]
+    cmds = []
     i = 0
     for ds in env.dataStructures:
-        if "Optimistic" not in ds and ds not in env.baselineDataStructures:
+        if "Optimistic" not in ds and ds not in env.baselineDataStructuresSet:
             continue
-        if ds in env.baselineDataStructures:
+        if ds in env.baselineDataStructuresSet:
             sizeThreadsForDs = '0'
             for workloadThreads in workload_threads:
                 i += 1
-                if ds not in env.baselineDataStructures:
-                    sizeThreadsForDs = size_threads
-                else:
-                    sizeThreadsForDs = '0'
-                cmd = (
-                    f"{cmd_base}{workloadThreads} {sizeThreadsForDs} {total_runs} {run_time} {size_delay} {ds} "
-                    f"-ins{insert_rate} -del{delete_rate} -initSize{init_size} -prefill -file-build/data-trials{i}.csv"
-                )
-                if os.system(cmd) != 0:
-                    exit(1)
+                cmds.append(cmd_base + [str(workloadThreads), sizeThreadsForDs] + run_args + [ds] + workload_args
+                            + ["-prefill", f"-file-build/data-trials{i}.csv"])
         else:
             sizeThreadsForDs = size_threads
             for retry in retry_list:
                 for workloadThreads in workload_threads:
                     i += 1
-                    if ds not in env.baselineDataStructures:
-                        sizeThreadsForDs = size_threads
-                    else:
-                        sizeThreadsForDs = '0'
-                    cmd = (
-                        f"{cmd_base}{workloadThreads} {sizeThreadsForDs} {total_runs} {run_time} {size_delay} {ds} "
-                        f"-ins{insert_rate} -del{delete_rate} -initSize{init_size} -retry-{retry} -prefill -file-build/data-trials{i}.csv"
-                    )
-                    if os.system(cmd) != 0:
-                        exit(1)
+                    cmds.append(cmd_base + [str(workloadThreads), sizeThreadsForDs] + run_args + [ds] + workload_args
+                                + [f"-retry-{retry}", "-prefill", f"-file-build/data-trials{i}.csv"])
+
+    if not run_commands(cmds, jobs):
+        exit(1)
 
 
 def create_united_results_file() -> None:
@@ -89,9 +87,7 @@ def create_united_results_file() -> None:
 
 
 def draw_graphs():
-    os.makedirs(env.GRAPH_DIR, exist_ok=True)
-    for alg in env.baselineDataStructures:
-        os.makedirs(os.path.join(env.GRAPH_DIR,alg), exist_ok=True)
+    ensure_graph_dirs()
 
 
     united_graph_file_path = os.path.join(env.GRAPH_DIR, "%s" , graph_name + "_united_%s_" + benchmark_name + ".png")
@@ -104,7 +100,11 @@ benchmark_name = (
 )
 results_file_path = os.path.join(env.DATA_DIR, f"{graph_name}_{benchmark_name}.csv")
 
-delete_previous_results()
-run_experiments()
-create_united_results_file()
-draw_graphs()
+def main():
+    delete_previous_results()
+    run_experiments()
+    create_united_results_file()
+    draw_graphs()
+
+if __name__ == "__main__":
+    main()
@@ -12,8 +12,10 @@ import experiments_environment as env
 from experiment_utils import (
     clear_previous_results,
     concat_results,
+    ensure_graph_dirs,
     java_cmd,
     parse_int_list,
+    run_commands,
 )
 
 parser = argparse.ArgumentParser(
@@ -35,6 +37,12 @@ parser.add_argument("--warmup-runs", type=int, required=True, help="Number of wa
 parser.add_argument("--repeats", type=int, required=True, help="Number of measured repetitions")
 parser.add_argument("--runtime", required=True, help="Benchmark runtime per repetition")
 parser.add_argument("--jvm-mem", required=True, help="JVM memory size (e.g., 1G)")
+parser.add_argument(
+    "--jobs",
+    type=int,
+    default=1,
+    help="Number of benchmark runs to execute concurrently (keep 1 when measuring throughput)",
+)
 
 args = parser.parse_args()
 
@@ -55,6 +63,7 @@ warmup_runs = args.warmup_runs
 total_runs = warmup_runs + args.repeats
 run_time = args.runtime
 jvm_mem = args.jvm_mem
+jobs = args.jobs
 
 def delete_previous_results() -> None:
     """Remove artifacts from earlier runs."""
@@ -63,23 +72,24 @@ def delete_previous_results() -> None:
 def run_experiments() -> None:
     """Launch the Java benchmarks for all data structures."""
     cmd_base = java_cmd(jvm_mem)
+    # Arguments shared by all runs, with the optional zipfian parameter
+    run_args = [str(total_runs), run_time, size_delay]
+    workload_args = [f"-ins{insert_rate}", f"-del{delete_rate}"]
+    if is_zipfian:
+        workload_args.append("-zipf")
+    workload_args += [f"-initSize{init_size}", "-prefill"]
+
+    cmds = []
     run_id = 0
     for ds in env.dataStructures:
+        size_for_ds = size_threads if ds not in env.baselineDataStructuresSet else "0"
         for threads in workload_threads:
             run_id += 1
-            size_for_ds = size_threads if ds not in env.baselineDataStructures else "0"
-            
-            # Build command with optional zipfian parameter
-            cmd = f"{cmd_base}{threads} {size_for_ds} {total_runs} {run_time} {size_delay} {ds} "
-            cmd += f"-ins{insert_rate} -del{delete_rate} "
-            
-            if is_zipfian:
-                cmd += f"-zipf "
-                
-            cmd += f"-initSize{init_size} -prefill -file-build/data-trials{run_id}.csv"
-            
-            if os.system(cmd) != 0:
-                exit(1)
+            cmds.append(cmd_base + [str(threads), size_for_ds] + run_args + [ds] + workload_args
+                        + [f"-file-build/data-trials{run_id}.csv"])
+
+    if not run_commands(cmds, jobs):
+        exit(1)
 
 def create_united_results_file() -> None:
     """Concatenate all trial CSVs into the final results file."""
@@ -87,9 +97,7 @@ def create_united_results_file() -> None:
 
 def draw_graphs():
     """Generate graphs from the experiment results."""
-    os.makedirs(env.GRAPH_DIR, exist_ok=True)
-    for alg in env.baselineDataStructures:
-        os.makedirs(os.path.join(env.GRAPH_DIR, alg), exist_ok=True)
+    ensure_graph_dirs()
 
     # Generate bar charts
     united_bars_file_path = os.path.join(env.GRAPH_DIR, "%s", graph_name + "_united_bar_%s_" + benchmark_name + ".png")
@@ -105,8 +113,12 @@ benchmark_name = f"{init_size}setSize_{insert_rate}ins-{delete_rate}rem_{size_th
 
 results_file_path = os.path.join(env.DATA_DIR, f"{graph_name}_{benchmark_name}.csv")
 
-# Execute the experiment pipeline
-delete_previous_results()
-run_experiments()
-create_united_results_file()
-draw_graphs()
\ No newline at end of file
+def main():
+    """Execute the experiment pipeline."""
+    delete_previous_results()
+    run_experiments()
+    create_united_results_file()
+    draw_graphs()
+
+if __name__ == "__main__":
+    main()
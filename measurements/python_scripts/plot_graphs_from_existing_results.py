@@ -5,6 +5,7 @@ import re
 import logging
 import plot_utils as graph
 import experiments_environment as env
+from experiment_utils import ensure_graph_dirs
 
 # Configure logging with color
 logging.basicConfig(level=logging.INFO, format='\033[93m%(asctime)s - %(levelname)s - %(message)s\033[0m')
@@ -12,19 +13,20 @@ logging.basicConfig(level=logging.INFO, format='\033[93m%(asctime)s - %(levelnam
 # Number of warmup runs to ignore when averaging results
 warmupRepeats = 5 # CHANGE THIS VALUE IF NEEDED
 
+# Compiled patterns for the file name components, with the function extracting each value
+PARAM_PATTERNS = {
+    'size': (re.compile(r"(\d+)setSize"), lambda x: int(x.group(1))),
+    'ins_rem': (re.compile(r"(\d+)ins-(\d+)rem"), lambda x: map(int, x.groups())),
+    'threads': (re.compile(r"(\d+)(sizeThreads|workloadThreads)"),
+               lambda x: (int(x.group(1)), x.group(2))),
+    'delay': (re.compile(r"(\d+)delay"), lambda x: int(x.group(1))),
+    'zipf': (re.compile(r"(\d+(?:\.\d+)?)zipf"), lambda x: x.group(1))
+}
+
 def extract_params(params, param_type):
     """Extract parameters from file name components using regex."""
-    patterns = {
-        'size': (r"(\d+)setSize", lambda x: int(x.group(1))),
-        'ins_rem': (r"(\d+)ins-(\d+)rem", lambda x: map(int, x.groups())),
-        'threads': (r"(\d+)(sizeThreads|workloadThreads)", 
-                   lambda x: (int(x.group(1)), x.group(2))),
-        'delay': (r"(\d+)delay", lambda x: int(x.group(1))),
-        'zipf': (r"(\d+(?:\.\d+)?)zipf", lambda x: x.group(1))
-    }
-    
-    pattern, extract_func = patterns[param_type]
-    match = re.search(pattern, params)
+    pattern, extract_func = PARAM_PATTERNS[param_type]
+    match = pattern.search(params)
     if not match:
         raise ValueError(f"{param_type} parameter not found in: {params}")
     return extract_func(match)
@@ -41,13 +43,12 @@ def construct_benchmark_name(params):
 def main():
     # Setup output directories
     workingDir = os.path.join(env.DATA_DIR)
-    os.makedirs(env.GRAPH_DIR, exist_ok=True)
-    for alg in env.baselineDataStructures:
-        os.makedirs(os.path.join(env.GRAPH_DIR, alg), exist_ok=True)
+    ensure_graph_dirs()
     
     # Process all CSV files
-    csv_files = [f for f in os.listdir(workingDir) 
-                if f.endswith(".csv") and "statistics" not in f]
+    with os.scandir(workingDir) as entries:
+        csv_files = [entry.name for entry in entries
+                     if entry.name.endswith(".csv") and "statistics" not in entry.name and entry.is_file()]
     logging.info(f"Processing {len(csv_files)} CSV files for graph generation")
 
     for filename in csv_files:
@@ -1,16 +1,23 @@
 """Utility functions for generating publication quality figures."""
 
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+import functools
 import logging
+import multiprocessing
+import os
 from textwrap import wrap
 import numpy as np
 import matplotlib as mpl
 from io_utils import (
     WorkloadOpType,
+    getAlgsByBaseline,
     getBaselineAlg,
     isSizeAlgorithm,
-    read_java_results_file,
+    load_results,
+    load_results_array,
     sizeDataStrucutres,
-    toString,
+    toStringBatch,
     toStringSplit,
 )
 
@@ -21,6 +28,8 @@ logging.basicConfig(level=logging.INFO, format='\033[92m%(asctime)s - %(levelnam
 mpl.use("Agg")
 
 import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
+from matplotlib.lines import Line2D
 
 mpl.rcParams["grid.linestyle"] = ":"
 mpl.rcParams["grid.color"] = "black"
@@ -28,6 +37,16 @@ mpl.rcParams.update({"font.size": 12})
 
 # Constants
 areGraphsForPaper = True  # To set hard-coded graph y limits as in the paper
+# Resolution of the saved graphs; e.g. FIG_DPI=150 renders faster while iterating on the plots
+FIG_DPI = int(os.environ.get("FIG_DPI", 300))
+# zlib level of the saved PNGs; level 1 encodes much faster than Pillow's default of 6 for slightly larger files
+PNG_PIL_KWARGS = {"compress_level": int(os.environ.get("PNG_COMPRESS_LEVEL", 1))}
+# Processes used to render the graphs of a plot function concurrently, e.g. PLOT_JOBS=8; by default
+# the graphs are rendered in-process
+PLOT_JOBS = int(os.environ.get("PLOT_JOBS", 1))
+# With PLOT_SKIP_FRESH=1, graphs newer than their results file are kept instead of being redrawn. Only
+# modification times are compared, so leave it unset after changing warmupRepeats or the plotting code
+SKIP_FRESH_GRAPHS = os.environ.get("PLOT_SKIP_FRESH") == "1"
 
 # Algorithm display names
 names = {'BST': 'BST',
@@ -122,6 +141,10 @@ markers = {
     'BarrierHashTable': '1',
 }
 
+# Display style of each algorithm, gathered from the dicts above so that one lookup gives all of it
+AlgStyle = namedtuple('AlgStyle', ['name', 'color', 'linestyle', 'marker'])
+styles = {alg: AlgStyle(names[alg], colors[alg], linestyles[alg], markers[alg]) for alg in names}
+
 # Ordering used for graph legends
 algs_order = [
     "HashTable",
@@ -146,212 +169,265 @@ algs_order = [
     "BarrierBST",
 ]
 
+@functools.lru_cache(maxsize=32)
+def get_datastructure_alg_map(algs):
+    """Map each baseline to the algorithms of its family found in the ``algs`` tuple, baseline first."""
+    algsSet = frozenset(algs)
+    return {baselineAlg: tuple(alg for alg in [baselineAlg] + sizeAlgs if alg in algsSet)
+            for baselineAlg, sizeAlgs in sizeDataStrucutres.items()}
+
 def get_datastructure_algs(baselineAlg, algs, include_baseline=False):
-    """Get list of algorithms that belong to a data structure family."""
-    if include_baseline:
-        return [alg for alg in [baselineAlg] + sizeDataStrucutres[baselineAlg] if alg in algs]
-    return [alg for alg in sizeDataStrucutres[baselineAlg] if alg in algs]
+    """Get the algorithms of ``algs`` that belong to a data structure family, in sizeDataStrucutres order."""
+    familyAlgs = get_datastructure_alg_map(tuple(algs))[baselineAlg]
+    if include_baseline or familyAlgs[:1] != (baselineAlg,):
+        return familyAlgs
+    return familyAlgs[1:]
+
+def needs_rebuild(input_path, output_path):
+    """Return whether ``output_path`` must be drawn: always, unless PLOT_SKIP_FRESH=1 and it is newer than ``input_path``."""
+    if not SKIP_FRESH_GRAPHS or not os.path.exists(output_path):
+        return True
+    return os.path.getmtime(output_path) < os.path.getmtime(input_path)
+
+def needs_any_rebuild(input_path, output_graph_path):
+    """Return whether any baseline's graph from the ``%s`` template ``output_graph_path`` needs_rebuild.
+
+    Checked before parsing ``input_path``, so that a file whose graphs are all up to date is not read.
+    """
+    placeholders = output_graph_path.count('%s')
+    return any(needs_rebuild(input_path, output_graph_path % ((baselineAlg,) * placeholders))
+               for baselineAlg in sizeDataStrucutres)
+
+def run_in_processes(render, graphs):
+    """Call ``render(*args)`` for each tuple of ``graphs``, spread over up to PLOT_JOBS processes."""
+    jobs = min(PLOT_JOBS, len(graphs))
+    if jobs <= 1:
+        for args in graphs:
+            render(*args)
+        return
+    # Forked workers inherit the loaded modules instead of re-importing the calling script,
+    # which the spawn and forkserver start methods would run again in every worker
+    mpContext = multiprocessing.get_context("fork") if "fork" in multiprocessing.get_all_start_methods() else None
+    with ProcessPoolExecutor(max_workers=jobs, mp_context=mpContext) as executor:
+        for future in [executor.submit(render, *args) for args in graphs]:
+            future.result()
+
+def compute_tp_loss(algsTP, baselineTP):
+    """Return the % TP loss of each algorithm (rows of ``algsTP``) against ``baselineTP``, and its max and min.
+
+    Missing results are NaN and are ignored by the extrema. The inputs come from ``load_results_array`` and
+    so only carry float32 precision (about 7 significant digits), which is ample for the rounded bar labels;
+    the upcast to float64 just avoids adding float32 rounding in the division itself.
+    """
+    tpLoss = 100 - np.asarray(algsTP, dtype=np.float64) / np.asarray(baselineTP, dtype=np.float64) * 100
+    return tpLoss, np.nanmax(tpLoss), np.nanmin(tpLoss)
+
+def plot_dotted_series(axs, xs, seriesList, seriesColors, labels, opacity):
+    """Draw dotted lines with 'x' markers for all series at once and return their legend handles."""
+    xs = np.asarray(xs, dtype=float)
+    ys = np.array(seriesList, dtype=float)
+    axs.add_collection(LineCollection(np.stack(np.broadcast_arrays(xs, ys), axis=-1), colors=seriesColors,
+                                      linestyles='dotted', linewidths=1.75, alpha=opacity))
+    axs.scatter(np.broadcast_to(xs, ys.shape).ravel(), ys.ravel(), s=7 ** 2, marker='x',
+                c=np.repeat(seriesColors, len(xs)), linewidths=mpl.rcParams['lines.markeredgewidth'],
+                alpha=opacity, zorder=2)
+    axs.autoscale_view()
+    return [Line2D([], [], color=color, linestyle='dotted', linewidth=1.75, marker='x', markersize=7,
+                   alpha=opacity, label=label) for color, label in zip(seriesColors, labels)]
+
+def label_bars(axs, rects, labels, textSpace):
+    """Write ``labels[alg]`` vertically ``textSpace`` data units above the bars ``rects[alg]``.
+
+    The y limits must already be set, as bar_label takes its offset in points.
+    """
+    ybottom, ytop = axs.get_ylim()
+    padding = textSpace / (ytop - ybottom) * axs.bbox.height * 72 / axs.figure.dpi
+    for alg, algRects in rects.items():
+        for text in axs.bar_label(algRects, labels=labels[alg], padding=padding, rotation=90, fontsize=7):
+            # Keep showing the values of bars cut off by the y limit, above the graph
+            text.set_annotation_clip(False)
+
+def draw_horizontal_lines(axs, ys, **kwargs):
+    """Draw black lines across the whole width of ``axs`` at heights ``ys`` with a single artist."""
+    if len(ys):
+        axs.hlines(ys, 0, 1, transform=axs.get_yaxis_transform(), color='k', **kwargs)
+
+def reset_axes(axs):
+    """Clear ``axs`` for the next graph drawn on the same figure."""
+    axs.clear()
+    for spine in axs.spines.values():
+        spine.set_visible(True)
 
 def plot_united_overhead_bars(input_file_path, output_graph_path, warmupRepeats):
     """Draw a grouped bar chart comparing all algorithms' overhead."""
+    if not needs_any_rebuild(input_file_path, output_graph_path):
+        return
     
     # Parse input data
-    results = {}
-    stddev = {}
-    workloadThreads = []
-    sizeThreads = []
-    ratios = []
-    initSizes = []
-    algs = []
+    _, _, workloadThreads, sizeThreads, ratios, initSizes, algs = load_results(
+        input_file_path, warmupRepeats, True)
+    workloadThreads = sorted(workloadThreads)
     yLimit = 20
     isZipfianMeasurement = 'zipfian' in input_file_path
     
-    read_java_results_file(
-        input_file_path, results, stddev, workloadThreads, sizeThreads, 
-        ratios, initSizes, algs, warmupRepeats, True, False
-    )
-    
     # Validate input data
     assert (len(sizeThreads) == 1)
     sizeThreadsNum = sizeThreads[0]
-    workloadThreads.sort()
     assert (len(initSizes) == 1)
     initSize = initSizes[0]
     assert (len(ratios) == 1)
     percentageRatio = ratios[0]
+
+    # TP by [algorithm, workload threads (sorted), size threads] for the file's init size and ratio
+    resultsArray = load_results_array(input_file_path, warmupRepeats, True)
+    algIndex = resultsArray.algIndex
+    sizeThreadsIndex = resultsArray.sizeThreadsIndex
+    tpArray = resultsArray.throughput[..., resultsArray.initSizeIndex[initSize], resultsArray.ratioIndex[percentageRatio]]
+    tpArray = tpArray[:, [resultsArray.workloadThreadsIndex[th] for th in workloadThreads]]
     
-    # Process each baseline algorithm
+    # Compute the graph of each baseline algorithm, then render them
+    graphs = []
     for baselineAlg in [baseAlg for baseAlg in algs if baseAlg in sizeDataStrucutres.keys()]:
         # Collect algorithms for this data structure
-        datastructureAlgs = [alg for alg in sizeDataStrucutres[baselineAlg] if alg in algs]
+        datastructureAlgs = get_datastructure_algs(baselineAlg, algs)
         if not datastructureAlgs:
             continue
+        path = output_graph_path % (baselineAlg, baselineAlg)
+        if not needs_rebuild(input_file_path, path):
+            continue
             
-        # Calculate TP loss percentage for each algorithm
-        series = {}
-        for alg in datastructureAlgs:
-            series[alg] = []
-            
-        for th in workloadThreads:
-            baselineKey = toString(baselineAlg, th, 0, initSize, percentageRatio)
-            for alg in datastructureAlgs:
-                key = toString(alg, th, sizeThreadsNum, initSize, percentageRatio)
-                if key in results:
-                    # Calculate throughput loss percentage
-                    series[alg].append(100 - results[key] / results[baselineKey] * 100)
+        # Calculate TP loss percentage for each algorithm (one row per algorithm, one column per thread count)
+        baselineTP = tpArray[algIndex[baselineAlg], :, sizeThreadsIndex[0]]
+        algsTP = tpArray[[algIndex[alg] for alg in datastructureAlgs], :, sizeThreadsIndex[sizeThreadsNum]]
+        tpLoss, maxLoss, minLoss = compute_tp_loss(algsTP, baselineTP)
 
         # Find min/max values for y-axis scaling
-        maxValueDict = {alg: max(max(series[alg]), 10) for alg in datastructureAlgs}
-        minValueDict = {alg: min(min(series[alg]), 0) for alg in datastructureAlgs}
-        
-        maxValue = max(maxValueDict.values())
+        maxValue = max(maxLoss, 10)
         ytop = min(maxValue, yLimit) if areGraphsForPaper else maxValue
-        ybot = min(minValueDict.values())
-        
-        # Create plot
-        fig, axs = plt.subplots(figsize=(6.5, (ytop - ybot + 2) / 21 * 1.8 - 0.2))
-        
-        # Set up bar chart parameters
-        total_width = 1
-        width = (total_width / len(datastructureAlgs)) * 0.75
-        x = np.arange(len(workloadThreads))
-        to_add = (len(datastructureAlgs) // 2) * (-width)
-        
-        # Draw bars for each algorithm
-        for alg in datastructureAlgs:
-            axs.bar(x + to_add, series[alg], width, label=names[alg], color=colors[alg])
-            
-            # Add value labels on bars
-            for i in range(len(workloadThreads)):
-                # Format the text and determine positioning
-                text_length = 3.55 
-                fontsize = 8
-                delta = 0.7
-                
-                rounded_value = round(series[alg][i], 1)
-                if rounded_value == 0.0:
-                    rounded_value = 0
-                    text_length -= 0.3
-                    
-                formatted_value = f"{rounded_value:.1f}"
-                if formatted_value.endswith('.0'):
-                    formatted_value = formatted_value[:-2]
-                    text_length -= 1.5
-
-                # Position text based on value
-                if rounded_value >= text_length:
-                    text_color = 'white'  # White text for dark backgrounds
-                    axs.text((x + to_add)[i], min(rounded_value, 20) - delta,
-                             formatted_value, ha='center', va='bottom',
-                             fontsize=fontsize, rotation=90, color=text_color)
-                elif rounded_value < text_length and rounded_value >= 0:
-                    text_color = 'black'  # Black text for light backgrounds
-                    axs.text((x + to_add)[i], min(rounded_value + text_length, 20),
-                             formatted_value, ha='center', va='bottom',
-                             fontsize=fontsize, rotation=90, color=text_color)
-                else:
-                    text_color = 'red'  # Red text for negative values
-                    axs.text((x + to_add)[i], text_length + 0.7,
-                             formatted_value, ha='center', va='bottom',
-                             fontsize=fontsize, rotation=90, color=text_color)
-            
-            to_add += width
-            
-        # Configure plot appearance
-        axs.set_xticks(x)
-        axs.set_xticklabels(workloadThreads)
-        plt.tick_params(axis='x', bottom=False, top=True, labelbottom=False, labeltop=True)
+        ybot = min(minLoss, 0)
+        graphs.append((datastructureAlgs, tpLoss, ytop, ybot, workloadThreads, path))
+
+    run_in_processes(_render_overhead_bars, graphs)
+
+def _render_overhead_bars(datastructureAlgs, tpLoss, ytop, ybot, workloadThreads, path):
+    """Draw and save the overhead bar chart of one data structure."""
+    # Create plot
+    fig, axs = plt.subplots(figsize=(6.5, (ytop - ybot + 2) / 21 * 1.8 - 0.2))
+
+    # Set up bar chart parameters
+    total_width = 1
+    width = (total_width / len(datastructureAlgs)) * 0.75
+    x = np.arange(len(workloadThreads))
+    # Bar positions of every algorithm, one row per algorithm
+    positions = x + ((np.arange(len(datastructureAlgs)) - len(datastructureAlgs) // 2) * width)[:, np.newaxis]
+    
+    # Draw the bars of all algorithms with a single call, coloured per algorithm
+    axs.bar(positions.ravel(), np.ravel(tpLoss), width,
+            color=np.repeat([styles[alg].color for alg in datastructureAlgs], len(x)))
+
+    # Add value labels on bars: format the texts, then position all of them at once
+    fontsize = 8
+    delta = 0.7
+    roundedValues = np.round(np.ravel(tpLoss), 1) + 0.0  # adding 0.0 turns -0.0 into 0.0
+    formattedValues = [f"{value:.1f}" for value in roundedValues.tolist()]
+    isWholeNumber = np.array([value.endswith('.0') for value in formattedValues])
+    formattedValues = [value[:-2] if value.endswith('.0') else value for value in formattedValues]
+    text_length = 3.55 - 0.3 * (roundedValues == 0) - 1.5 * isWholeNumber
+    # White text inside long bars, black text past short ones and red text for negative values
+    isInside = roundedValues >= text_length
+    isPositive = roundedValues >= 0
+    ys = np.where(isInside, np.minimum(roundedValues, 20) - delta,
+                  np.where(isPositive, np.minimum(roundedValues + text_length, 20), text_length + 0.7))
+    textColors = np.where(isInside, 'white', np.where(isPositive, 'black', 'red'))
+    addText = axs.text
+    for xPos, yPos, formattedValue, textColor in zip(positions.ravel().tolist(), ys.tolist(),
+                                                      formattedValues, textColors.tolist()):
+        addText(xPos, yPos, formattedValue, ha='center', va='bottom',
+                fontsize=fontsize, rotation=90, color=textColor)
         
-        # Set y-axis ticks and labels
-        TP_loss_percentages = np.arange(20) * 10 - 100
-        axs.set_yticks(TP_loss_percentages)
-        axs.set_yticklabels(TP_loss_percentages)
-        axs.set(ylabel='% TP loss')
-        axs.set_ylim(bottom=ybot, top=ytop + 2)
-        axs.invert_yaxis()
+    # Configure plot appearance
+    axs.set_xticks(x)
+    axs.set_xticklabels(workloadThreads)
+    axs.tick_params(axis='x', bottom=False, top=True, labelbottom=False, labeltop=True)
+    
+    # Set y-axis ticks and labels
+    TP_loss_percentages = np.arange(20) * 10 - 100
+    axs.set_yticks(TP_loss_percentages)
+    axs.set_yticklabels(TP_loss_percentages)
+    axs.set(ylabel='% TP loss')
+    axs.set_ylim(bottom=ybot, top=ytop + 2)
+    axs.invert_yaxis()
+    
+    # Remove spines
+    for spine in ['bottom', 'right', 'left', 'top']:
+        axs.spines[spine].set_visible(False)
         
-        # Remove spines
-        for spine in ['bottom', 'right', 'left', 'top']:
-            axs.spines[spine].set_visible(False)
-            
-        axs.set_axisbelow(True)
+    axs.set_axisbelow(True)
+    
+    # Add horizontal grid lines every 10% from -100% up to the top of the graph, solid at 0%
+    yLineValues = np.arange(-100, ytop + 2 + 10, 10)
+    yLineValues = yLineValues[yLineValues <= ytop + 2]
+    draw_horizontal_lines(axs, yLineValues[yLineValues != 0], linewidth=0.8, alpha=0.4, linestyle='--')
+    draw_horizontal_lines(axs, yLineValues[yLineValues == 0], linewidth=0.8, alpha=0.4, linestyle='-')
         
-        # Add horizontal grid lines
-        yLineValue = -100
-        while yLineValue <= ytop + 2:
-            linestyle = '-' if yLineValue == 0 else '--'
-            plt.axhline(y=yLineValue, linewidth=0.8, color='k', linestyle=linestyle, alpha=0.4)
-            yLineValue += 10
-            
-        # Save the figure
-        path = output_graph_path % (baselineAlg, baselineAlg)
-        plt.savefig(path, bbox_inches='tight', dpi=300)
-        plt.close('all')
+    # Save the figure
+    fig.savefig(path, bbox_inches='tight', dpi=FIG_DPI, pil_kwargs=PNG_PIL_KWARGS)
+    plt.close(fig)
 
 def plot_united_overhead_graph(input_file_path, output_graph_path, warmupRepeats):
     """Plot all algorithms on one overhead graph."""
-    throughput = {}
-    stddev = {}
-    workloadThreads = []
-    sizeThreads = []
-    ratios = []
-    initSizes = []
-    algs = []
+    if not needs_any_rebuild(input_file_path, output_graph_path):
+        return
+    throughput, stddev, workloadThreads, sizeThreads, ratios, initSizes, algs = load_results(
+        input_file_path, warmupRepeats, True)
+    workloadThreads = sorted(workloadThreads)
     isZipfianMeasurement = 'zipfian' in input_file_path
-
-    read_java_results_file(input_file_path, throughput, stddev, workloadThreads, sizeThreads, ratios, initSizes, algs,
-                           warmupRepeats, True)
     assert (len(sizeThreads) == 1)
     sizeThreadsNum = sizeThreads[0]
-    workloadThreads.sort()
     assert (len(initSizes) == 1)
     initSize = initSizes[0]
     assert (len(ratios) == 1)
     percentageRatio = ratios[0]
 
+    # One figure is reused for the graphs of all data structures
+    fig, axs = plt.subplots(figsize=(6.5, 2.2) if areGraphsForPaper else (6.5, 4.2))
     for baselineAlg in sizeDataStrucutres.keys():
-        sizeAlgs = sizeDataStrucutres[baselineAlg]
-        _datastructureAlgs = [baselineAlg] + sizeAlgs
-        datastructureAlgs = [alg for alg in _datastructureAlgs if alg in algs]
+        datastructureAlgs = get_datastructure_algs(baselineAlg, algs, include_baseline=True)
         if len(datastructureAlgs) == 0:
             continue
+        path = output_graph_path % (baselineAlg, baselineAlg)
+        if not needs_rebuild(input_file_path, path):
+            continue
         series = {}
         error = {}
         ymax = 0
 
+        # Keys of the baseline are shared by every non-size algorithm of this data structure
+        baselineKeys = toStringBatch(baselineAlg, workloadThreads, 0, initSize, percentageRatio)
         for alg in datastructureAlgs:
-            series[alg] = []
-            error[alg] = []
-
-        for th in workloadThreads:
-            for alg in datastructureAlgs:
-                if isSizeAlgorithm(alg):
-                    key = toString(alg, th, sizeThreadsNum,
-                                   initSize, percentageRatio)
-                else:
-                    key = toString(baselineAlg, th, 0,
-                                   initSize, percentageRatio)
-                assert key in throughput
-                series[alg].append(throughput[key])
-                error[alg].append(stddev[key])
+            if isSizeAlgorithm(alg):
+                keys = toStringBatch(alg, workloadThreads, sizeThreadsNum, initSize, percentageRatio)
+            else:
+                keys = baselineKeys
+            assert all(key in throughput for key in keys)
+            series[alg] = [throughput[key] for key in keys]
+            error[alg] = [stddev[key] for key in keys]
 
-        if areGraphsForPaper:
-            fig, axs = plt.subplots(figsize=(6.5, 2.2))
-        else:
-            fig, axs = plt.subplots(figsize=(6.5, 4.2))
+        reset_axes(axs)
         opacity = 0.8
         rects = {}
 
         for alg in datastructureAlgs:
             ymax = max(ymax, max(series[alg]))
+            style = styles[alg]
             rects[alg] = axs.plot(workloadThreads, series[alg],
                                   alpha=opacity,
-                                  color=colors[alg],
-                                  linestyle=linestyles[alg],
+                                  color=style.color,
+                                  linestyle=style.linestyle,
                                   linewidth=1.75,
-                                  marker=markers[alg],
+                                  marker=style.marker,
                                   markersize=7,
-                                  label=names[alg])
+                                  label=style.name)
 
         if areGraphsForPaper:
             if 'HashTable' in alg:
@@ -366,13 +442,14 @@ def plot_united_overhead_graph(input_file_path, output_graph_path, warmupRepeats
             axs.set_ylim(bottom=-0.02 * ytop, top=ytop)
         else:
             axs.set_ylim(bottom=-0.02 * ymax)
-        plt.xticks(workloadThreads, workloadThreads)
+        axs.set_xticks(workloadThreads)
+        axs.set_xticklabels(workloadThreads)
         ylabel = 'Workload threads total TP (Mop/s)'
         wrapped_ylabel = "\n".join(wrap(ylabel, 20))
         axs.set(xlabel='Workload threads', ylabel=wrapped_ylabel)
         legend_x = 1
         legend_y = 0.5
-        legend = plt.legend(loc='center left', bbox_to_anchor=(
+        legend = axs.legend(loc='center left', bbox_to_anchor=(
             legend_x, legend_y), ncol=len(rects), fontsize='xx-small')
 
         legend_name = "legend_zipfian_overhead" if isZipfianMeasurement else "legend_overhead"
@@ -380,70 +457,45 @@ def plot_united_overhead_graph(input_file_path, output_graph_path, warmupRepeats
             legend, f"graphs/{baselineAlg}/{legend_name}.png")
         legend.remove()
 
-        plt.grid()
+        axs.grid()
         axs.set_axisbelow(True)
-        plt.savefig(output_graph_path %
-                    (baselineAlg, baselineAlg), bbox_inches='tight', dpi=300)
-        plt.close('all')
+        fig.savefig(path, bbox_inches='tight', dpi=FIG_DPI, pil_kwargs=PNG_PIL_KWARGS)
+    plt.close(fig)
 
 def plot_scalability_graph(input_file_path, output_graph_path, warmupRepeats):
     """Plot scalability curves for size threads."""
-    throughput = {}
-    stddev = {}
-    workloadThreads = []
-    sizeThreads = []
-    ratios = []
-    initSizes = []
-    algs = []
-
-    read_java_results_file(input_file_path, throughput, stddev, workloadThreads, sizeThreads, ratios, initSizes, algs,
-                           warmupRepeats, False)
+    if not needs_any_rebuild(input_file_path, output_graph_path):
+        return
+    _, _, workloadThreads, sizeThreads, ratios, initSizes, algs = load_results(
+        input_file_path, warmupRepeats, False)
+    sizeThreads = sorted(sizeThreads)
     assert (len(workloadThreads) == 1)
-    workloadThreadsNum = workloadThreads[0]
-    sizeThreads.sort()
 
+    # TP by [algorithm, size threads (sorted)] for the file's workload threads, init size and ratio,
+    # sliced once for all baselines
+    resultsArray = load_results_array(input_file_path, warmupRepeats, False)
+    algIndex = resultsArray.algIndex
+    tpArray = resultsArray.throughput[:, resultsArray.workloadThreadsIndex[workloadThreads[0]], :,
+                                      resultsArray.initSizeIndex[initSizes[0]], resultsArray.ratioIndex[ratios[0]]]
+    tpArray = tpArray[:, [resultsArray.sizeThreadsIndex[th] for th in sizeThreads]]
+    measured = ~np.isnan(tpArray).any(axis=1)
+
+    # Compute the graph of each baseline algorithm, then render them
+    graphs = []
     ymax = 0
-    series = {}
-    error = {}
     for baselineAlg in list(set([getBaselineAlg(alg) for alg in algs])):
         if baselineAlg == None:
             continue
-        series = {}
-        rects = {}
-        datastructureAlgs = [
-            alg for alg in sizeDataStrucutres[baselineAlg] if alg in algs]
-        for alg in datastructureAlgs:
-            series[alg] = []
-            error[alg] = []
-            for th in sizeThreads:
-                if toString(alg, workloadThreadsNum, th, initSizes[0], ratios[0]) not in throughput:
-                    del series[alg]
-                    del error[alg]
-                    break
-                series[alg].append(
-                    throughput[toString(alg, workloadThreadsNum, th, initSizes[0], ratios[0])])
-                error[alg].append(
-                    stddev[toString(alg, workloadThreadsNum, th, initSizes[0], ratios[0])])
-
-        if areGraphsForPaper:
-            fig, axs = plt.subplots(figsize=(6.5, 2.2))
-        else:
-            fig, axs = plt.subplots(figsize=(6.5, 4.2))
-        opacity = 0.8
-        rects = {}
+        path = output_graph_path % baselineAlg
+        if not needs_rebuild(input_file_path, path):
+            continue
+        series = {alg: tpArray[algIndex[alg]].tolist()
+                  for alg in get_datastructure_algs(baselineAlg, algs) if measured[algIndex[alg]]}
 
-        for alg in algs_order:
-            if not alg in series:
-                continue
-            ymax = max(ymax, max(series[alg]))
-            rects[alg] = axs.plot(sizeThreads, series[alg],
-                                  alpha=opacity,
-                                  color=colors[alg],
-                                  linestyle=linestyles[alg],
-                                  linewidth=1.75,
-                                  marker=markers[alg],
-                                  markersize=7,
-                                  label=names[alg])
+        # Series in legend order, selected once before drawing
+        orderedSeries = [(alg, series[alg]) for alg in algs_order if alg in series]
+        for _, algSeries in orderedSeries:
+            ymax = max(ymax, max(algSeries))
 
         if areGraphsForPaper:
             if 'HashTable' in baselineAlg:
@@ -461,44 +513,58 @@ def plot_scalability_graph(input_file_path, output_graph_path, warmupRepeats):
                     ytop = 1500
                 else:
                     ytop = 5900
-            axs.set_ylim(bottom=-0.02 * ytop, top=ytop)
+            ylim = (-0.02 * ytop, ytop)
         else:
-            axs.set_ylim(bottom=-0.02 * ymax)
-
-        plt.xticks(sizeThreads, sizeThreads)
-        ylabel = 'Size threads total TP (Kop/s)'
-        wrapped_ylabel = "\n".join(wrap(ylabel, 17))
-
-        axs.set(xlabel='Size threads', ylabel=wrapped_ylabel)
-
-        legend_x = 1
-        legend_y = 0.5
-        legend = plt.legend(loc='center left', bbox_to_anchor=(
-            legend_x, legend_y), ncol=len(rects), fontsize='xx-small')
-        export_legend(legend, f"graphs/{baselineAlg}/legend_scalability.png")
-        legend.remove()
-
-        plt.grid()
-        axs.set_axisbelow(True)
-        plt.savefig(output_graph_path %
-                    baselineAlg, bbox_inches='tight', dpi=300)
-        plt.close('all')
+            ylim = (-0.02 * ymax, None)
+        graphs.append((baselineAlg, sizeThreads, orderedSeries, ylim, path))
+
+    run_in_processes(_render_scalability_graph, graphs)
+
+def _render_scalability_graph(baselineAlg, sizeThreads, orderedSeries, ylim, path):
+    """Draw and save the scalability graph of one data structure."""
+    fig, axs = plt.subplots(figsize=(6.5, 2.2) if areGraphsForPaper else (6.5, 4.2))
+    opacity = 0.8
+    rects = {}
+    for alg, algSeries in orderedSeries:
+        style = styles[alg]
+        rects[alg] = axs.plot(sizeThreads, algSeries,
+                              alpha=opacity,
+                              color=style.color,
+                              linestyle=style.linestyle,
+                              linewidth=1.75,
+                              marker=style.marker,
+                              markersize=7,
+                              label=style.name)
+
+    axs.set_ylim(bottom=ylim[0], top=ylim[1])
+    axs.set_xticks(sizeThreads)
+    axs.set_xticklabels(sizeThreads)
+    ylabel = 'Size threads total TP (Kop/s)'
+    wrapped_ylabel = "\n".join(wrap(ylabel, 17))
+
+    axs.set(xlabel='Size threads', ylabel=wrapped_ylabel)
+
+    legend_x = 1
+    legend_y = 0.5
+    legend = axs.legend(loc='center left', bbox_to_anchor=(
+        legend_x, legend_y), ncol=len(rects), fontsize='xx-small')
+    export_legend(legend, f"graphs/{baselineAlg}/legend_scalability.png")
+    legend.remove()
+
+    axs.grid()
+    axs.set_axisbelow(True)
+    fig.savefig(path, bbox_inches='tight', dpi=FIG_DPI, pil_kwargs=PNG_PIL_KWARGS)
+    plt.close(fig)
 
 def plot_united_retries_overhead_bars(input_file_path, output_graph_path, warmupRepeats):
     """Draw grouped bars for overhead retry experiments."""
-    throughput = {}
-    stddev = {}
-    workloadThreads = []
-    sizeThreads = []
-    ratios = []
-    initSizes = []
-    algs = []
-
-    read_java_results_file(input_file_path, throughput, stddev, workloadThreads, sizeThreads, ratios, initSizes, algs,
-                           warmupRepeats, True)
+    if not needs_any_rebuild(input_file_path, output_graph_path):
+        return
+    throughput, stddev, workloadThreads, sizeThreads, ratios, initSizes, algs = load_results(
+        input_file_path, warmupRepeats, True)
+    workloadThreads = sorted(workloadThreads)
     assert (len(sizeThreads) == 1)
     sizeThreadsNum = sizeThreads[0]
-    workloadThreads.sort()
     assert (len(initSizes) == 1)
     initSize = initSizes[0]
     assert (len(ratios) == 1)
@@ -506,6 +572,12 @@ def plot_united_retries_overhead_bars(input_file_path, output_graph_path, warmup
 
 
 
+    # One figure is reused for the graphs of all data structures
+    fig, axs = plt.subplots(figsize=(6.5, 4.2))
+    # Bar group positions are the same for every data structure
+    total_width = 1
+    x = np.arange(len(workloadThreads))
+    algsByBaseline = getAlgsByBaseline(algs, excludeWideRetries=True)
     for baselineAlg in sizeDataStrucutres.keys():
         if baselineAlg == 'BST':
             max_y = 60
@@ -516,51 +588,41 @@ def plot_united_retries_overhead_bars(input_file_path, output_graph_path, warmup
         else:
             max_y = 40
             jump = 10
-        datastructureAlgs = sorted(
-            [alg for alg in algs if baselineAlg in alg and "32" not in alg and "64" not in alg], key=lambda x: (len(x), x))
+        datastructureAlgs = list(algsByBaseline[baselineAlg])
         if datastructureAlgs == []:
             continue
+        path = output_graph_path % (baselineAlg, baselineAlg)
+        if not needs_rebuild(input_file_path, path):
+            continue
         datastructureAlgs.remove(baselineAlg)
         datastructureAlgs.insert(0, baselineAlg)
         series = {}
         rects = {}
+        # Keys of the baseline are shared by every non-size algorithm of this data structure
+        baselineKeys = toStringBatch(baselineAlg, workloadThreads, 0, initSize, percentageRatio)
         for alg in datastructureAlgs:
-            series[alg] = []
-        for th in workloadThreads:
-            for alg in datastructureAlgs:
-                if isSizeAlgorithm(alg):
-                    key = toString(alg, th, sizeThreadsNum,
-                                   initSize, percentageRatio)
-                else:
-                    key = toString(baselineAlg, th, 0,
-                                   initSize, percentageRatio)
-                assert key in throughput
-                series[alg].append(throughput[key])
+            if isSizeAlgorithm(alg):
+                keys = toStringBatch(alg, workloadThreads, sizeThreadsNum, initSize, percentageRatio)
+            else:
+                keys = baselineKeys
+            assert all(key in throughput for key in keys)
+            series[alg] = [throughput[key] for key in keys]
 
-        fig, axs = plt.subplots(figsize=(6.5, 4.2))
-        total_width = 1
+        reset_axes(axs)
         width = (total_width/len(datastructureAlgs))*0.75
-        x = np.arange(len(workloadThreads))
-        to_add = (len(datastructureAlgs)//2)*(-width)
+        positions = x + ((np.arange(len(datastructureAlgs)) - len(datastructureAlgs)//2) * width)[:, np.newaxis]
 
         _colors = ['C0', 'C5', 'C6', 'C7', 'C8', 'C9', 'C10', 'C11']
-        ci = 0
+        labels = {}
 
-        for alg in datastructureAlgs:
-            rects[alg] = axs.bar(x+to_add, series[alg],
+        for ci, (alg, algPositions) in enumerate(zip(datastructureAlgs, positions)):
+            rects[alg] = axs.bar(algPositions, series[alg],
                                  width, label=alg, color=_colors[ci])
-            for i in range(len(workloadThreads)):
-                rounded_value = f"{round(series[alg][i], 1):.1f}"
-                if rounded_value.endswith('.0'):
-                    rounded_value = rounded_value[:-2]
-                textSpace = max_y/50
-                axs.text((x+to_add)[i], series[alg][i] + textSpace, rounded_value,
-                         ha='center', va='bottom', rotation=90, fontsize=7)
-            to_add += width
-            ci += 1
+            labels[alg] = [f"{round(value, 1):.1f}" for value in series[alg]]
+            labels[alg] = [label[:-2] if label.endswith('.0') else label for label in labels[alg]]
         axs.set_xticks(x)
         axs.set_xticklabels(workloadThreads)
-        plt.tick_params(axis='x', bottom=True, top=False,
+        axs.tick_params(axis='x', bottom=True, top=False,
                         labelbottom=True, labeltop=False)
         ylabel = 'Workload threads total TP (Mop/s)'
         xlabel = 'Workload threads'
@@ -568,97 +630,76 @@ def plot_united_retries_overhead_bars(input_file_path, output_graph_path, warmup
         axs.set(ylabel=ylabel)
         axs.set_ylim(top=max_y)
         axs.set_ylim(bottom=0)
+        label_bars(axs, rects, labels, max_y/50)
         axs.spines['right'].set_visible(False)
         axs.spines['left'].set_visible(False)
         axs.spines['top'].set_visible(False)
         axs.set_axisbelow(True)
 
-        yLineValue = jump
-        while yLineValue <= max_y:
-            plt.axhline(y=yLineValue, linewidth=0.5, alpha=0.5,
-                        color='k', linestyle='--' if yLineValue != 0 else '-')
-
-            yLineValue += jump
-        path = output_graph_path % (baselineAlg, baselineAlg)
-        plt.savefig(path, bbox_inches='tight', dpi=300)
-        plt.close('all')
+        draw_horizontal_lines(axs, np.arange(jump, max_y + 1, jump), linewidth=0.5, alpha=0.5, linestyle='--')
+        fig.savefig(path, bbox_inches='tight', dpi=FIG_DPI, pil_kwargs=PNG_PIL_KWARGS)
+    plt.close(fig)
 
 def plot_united_retries_overhead_graph(input_file_path, output_graph_path, warmupRepeats):
     """Draw overhead graphs for retry experiments."""
-    throughput = {}
-    stddev = {}
-    workloadThreads = []
-    sizeThreads = []
-    ratios = []
-    initSizes = []
-    algs = []
-
-    read_java_results_file(input_file_path, throughput, stddev, workloadThreads, sizeThreads, ratios, initSizes, algs,
-                           warmupRepeats, True)
+    if not needs_any_rebuild(input_file_path, output_graph_path):
+        return
+    throughput, stddev, workloadThreads, sizeThreads, ratios, initSizes, algs = load_results(
+        input_file_path, warmupRepeats, True)
+    workloadThreads = sorted(workloadThreads)
     assert (len(sizeThreads) == 1)
     sizeThreadsNum = sizeThreads[0]
-    workloadThreads.sort()
     assert (len(initSizes) == 1)
     initSize = initSizes[0]
     assert (len(ratios) == 1)
     percentageRatio = ratios[0]
+    # One figure is reused for the graphs of all data structures
+    fig, axs = plt.subplots(figsize=(6.5, 4.2))
+    algsByBaseline = getAlgsByBaseline(algs)
     for baselineAlg in sizeDataStrucutres.keys():
-        datastructureAlgs = sorted(
-            [alg for alg in algs if baselineAlg in alg], key=lambda x: (len(x), x))
+        datastructureAlgs = list(algsByBaseline[baselineAlg])
         if len(datastructureAlgs) == 0:
             continue
+        path = output_graph_path % (baselineAlg, baselineAlg)
+        if not needs_rebuild(input_file_path, path):
+            continue
         datastructureAlgs.remove(baselineAlg)
         datastructureAlgs.insert(0, baselineAlg)
         series = {}
         error = {}
         ymax = 0
+        # Keys of the baseline are shared by every non-size algorithm of this data structure
+        baselineKeys = toStringBatch(baselineAlg, workloadThreads, 0, initSize, percentageRatio)
         for alg in datastructureAlgs:
-            series[alg] = []
-            error[alg] = []
-
-        for th in workloadThreads:
-            for alg in datastructureAlgs:
-                if isSizeAlgorithm(alg):
-                    key = toString(alg, th, sizeThreadsNum,
-                                   initSize, percentageRatio)
-                else:
-                    key = toString(baselineAlg, th, 0,
-                                   initSize, percentageRatio)
-                assert key in throughput
-                series[alg].append(throughput[key])
-                error[alg].append(stddev[key])
+            if isSizeAlgorithm(alg):
+                keys = toStringBatch(alg, workloadThreads, sizeThreadsNum, initSize, percentageRatio)
+            else:
+                keys = baselineKeys
+            assert all(key in throughput for key in keys)
+            series[alg] = [throughput[key] for key in keys]
+            error[alg] = [stddev[key] for key in keys]
 
-        fig, axs = plt.subplots(figsize=(6.5, 4.2))
+        reset_axes(axs)
         opacity = 0.8
-        rects = {}
+        seriesColors = []
+        labels = []
         i = 5
         for alg in datastructureAlgs:
+            ymax = max(ymax, max(series[alg]))
             if alg == baselineAlg:
-                ymax = max(ymax, max(series[alg]))
-                rects[alg] = axs.plot(workloadThreads, series[alg],
-                                      alpha=opacity,
-                                      color=colors[alg],
-                                      linestyle='dotted',
-                                      linewidth=1.75,
-                                      marker='x',
-                                      markersize=7,
-                                      label=alg)
+                seriesColors.append(styles[alg].color)
+                labels.append(alg)
                 continue
-            ymax = max(ymax, max(series[alg]))
 
             # Shorten algorithm names for this legend
             new_alg_name = alg.replace("Optimistic", "Opt")
             new_alg_name = new_alg_name.replace("Size", "")
 
-            rects[alg] = axs.plot(workloadThreads, series[alg],
-                                  alpha=opacity,
-                                  color='C'+str(i),
-                                  linestyle='dotted',
-                                  linewidth=1.75,
-                                  marker='x',
-                                  markersize=7,
-                                  label=new_alg_name)
+            seriesColors.append('C'+str(i))
+            labels.append(new_alg_name)
             i += 1
+        rects = plot_dotted_series(axs, workloadThreads, [series[alg] for alg in datastructureAlgs],
+                                   seriesColors, labels, opacity)
 
         if areGraphsForPaper:
             if 'HashTable' in alg:
@@ -671,64 +712,59 @@ def plot_united_retries_overhead_graph(input_file_path, output_graph_path, warmu
         else:
             axs.set_ylim(bottom=-0.02 * ymax)
 
-        plt.xticks(workloadThreads, workloadThreads)
+        axs.set_xticks(workloadThreads)
+        axs.set_xticklabels(workloadThreads)
         axs.set(xlabel='Workload threads',
                 ylabel='Workload threads total TP (Mop/s)')
         legend_x = 1
         legend_y = 0.5
-        legend = plt.legend(loc='center left', bbox_to_anchor=(
+        legend = axs.legend(handles=rects, loc='center left', bbox_to_anchor=(
             legend_x, legend_y), ncol=len(rects), fontsize='xx-small')
         export_legend(
             legend, f"graphs/{baselineAlg}/legend_retries_overhead.png")
         legend.remove()
 
-        plt.grid()
+        axs.grid()
         axs.set_axisbelow(True)
-        plt.savefig(output_graph_path %
-                    (baselineAlg, baselineAlg), bbox_inches='tight', dpi=300)
-        plt.close('all')
+        fig.savefig(path, bbox_inches='tight', dpi=FIG_DPI, pil_kwargs=PNG_PIL_KWARGS)
+    plt.close(fig)
 
 def plot_united_retries_scalability_graph(input_file_path, output_graph_path, warmupRepeats):
     """Plot retry scalability curves for all algorithms."""
-    throughput = {}
-    stddev = {}
-    workloadThreads = []
-    sizeThreads = []
-    ratios = []
-    initSizes = []
-    algs = []
-
-    read_java_results_file(input_file_path, throughput, stddev, workloadThreads, sizeThreads, ratios, initSizes, algs,
-                           warmupRepeats, False)
+    if not needs_any_rebuild(input_file_path, output_graph_path):
+        return
+    throughput, stddev, workloadThreads, sizeThreads, ratios, initSizes, algs = load_results(
+        input_file_path, warmupRepeats, False)
+    sizeThreads = sorted(sizeThreads)
     assert (len(workloadThreads) == 1)
     workloadThreadsNum = workloadThreads[0]
-    sizeThreads.sort()
 
+    # One figure is reused for the graphs of all data structures
+    fig, axs = plt.subplots(figsize=(6.5, 4.2))
     ymax = 0
     series = {}
     error = {}
+    algsByBaseline = getAlgsByBaseline(algs)
     for baselineAlg in sizeDataStrucutres.keys():
-        datastructureAlgs = sorted(
-            [alg for alg in algs if baselineAlg in alg], key=lambda x: (len(x), x))
+        datastructureAlgs = algsByBaseline[baselineAlg]
         if datastructureAlgs == []:
             continue
+        path = output_graph_path % baselineAlg
+        if not needs_rebuild(input_file_path, path):
+            continue
         series = {}
         rects = {}
         for alg in datastructureAlgs:
-            series[alg] = []
-            error[alg] = []
-            for th in sizeThreads:
-                if toString(alg, workloadThreadsNum, th, initSizes[0], ratios[0]) not in throughput:
-                    del series[alg]
-                    del error[alg]
-                    break
-                series[alg].append(
-                    throughput[toString(alg, workloadThreadsNum, th, initSizes[0], ratios[0])])
-                error[alg].append(
-                    stddev[toString(alg, workloadThreadsNum, th, initSizes[0], ratios[0])])
-        fig, axs = plt.subplots(figsize=(6.5, 4.2))
+            keys = toStringBatch(alg, workloadThreadsNum, sizeThreads, initSizes[0], ratios[0])
+            if not all(key in throughput for key in keys):
+                error.pop(alg, None)
+                continue
+            series[alg] = [throughput[key] for key in keys]
+            error[alg] = [stddev[key] for key in keys]
+        reset_axes(axs)
         opacity = 0.8
-        rects = {}
+        seriesColors = []
+        labels = []
 
         i = 6
         for alg in datastructureAlgs:
@@ -738,15 +774,11 @@ def plot_united_retries_scalability_graph(input_file_path, output_graph_path, wa
             new_alg_name = new_alg_name.replace("Size", "")
 
             ymax = max(ymax, max(series[alg]))
-            rects[alg] = axs.plot(sizeThreads, series[alg],
-                                  alpha=opacity,
-                                  color='C'+str(i),
-                                  linestyle='dotted',
-                                  linewidth=1.75,
-                                  marker='x',
-                                  markersize=7,
-                                  label=new_alg_name)
+            seriesColors.append('C'+str(i))
+            labels.append(new_alg_name)
             i += 1
+        rects = plot_dotted_series(axs, sizeThreads, [series[alg] for alg in datastructureAlgs],
+                                   seriesColors, labels, opacity)
 
         if areGraphsForPaper:
             ytop = 3500
@@ -756,7 +788,8 @@ def plot_united_retries_scalability_graph(input_file_path, output_graph_path, wa
         else:
             axs.set_ylim(bottom=-0.02 * ymax)
 
-        plt.xticks(sizeThreads, sizeThreads)
+        axs.set_xticks(sizeThreads)
+        axs.set_xticklabels(sizeThreads)
         ylabel = 'Size threads total TP (Kop/s)'
         wrapped_ylabel = "\n".join(wrap(ylabel, 20))
 
@@ -764,37 +797,36 @@ def plot_united_retries_scalability_graph(input_file_path, output_graph_path, wa
 
         legend_x = 1
         legend_y = 0.5
-        legend = plt.legend(loc='center left', bbox_to_anchor=(
+        legend = axs.legend(handles=rects, loc='center left', bbox_to_anchor=(
             legend_x, legend_y), ncol=len(rects), fontsize='xx-small')
         export_legend(
             legend, f"graphs/{baselineAlg}/legend_retries_scalability.png")
         legend.remove()
 
-        plt.grid()
+        axs.grid()
         axs.set_axisbelow(True)
-        plt.savefig(output_graph_path %
-                    baselineAlg, bbox_inches='tight', dpi=300)
-        plt.close('all')
+        fig.savefig(path, bbox_inches='tight', dpi=FIG_DPI, pil_kwargs=PNG_PIL_KWARGS)
+    plt.close(fig)
 
 def plot_united_retries_scalability_bars(input_file_path, output_graph_path, warmupRepeats):
     """Draw grouped bars for retry scalability experiments."""
-    throughput = {}
-    stddev = {}
-    workloadThreads = []
-    sizeThreads = []
-    ratios = []
-    initSizes = []
-    algs = []
-
-    read_java_results_file(input_file_path, throughput, stddev, workloadThreads, sizeThreads, ratios, initSizes, algs,
-                           warmupRepeats, False)
+    if not needs_any_rebuild(input_file_path, output_graph_path):
+        return
+    throughput, stddev, workloadThreads, sizeThreads, ratios, initSizes, algs = load_results(
+        input_file_path, warmupRepeats, False)
+    sizeThreads = sorted(sizeThreads)
     assert (len(workloadThreads) == 1)
     workloadThreadsNum = workloadThreads[0]
-    sizeThreads.sort()
     assert (len(initSizes) == 1)
     initSize = initSizes[0]
     assert (len(ratios) == 1)
     percentageRatio = ratios[0]
+    # One figure is reused for the graphs of all data structures
+    fig, axs = plt.subplots(figsize=(6.5, 4.2))
+    # Bar group positions are the same for every data structure
+    total_width = 1
+    x = np.arange(len(sizeThreads))
+    algsByBaseline = getAlgsByBaseline(algs, excludeWideRetries=True)
     for baselineAlg in sizeDataStrucutres.keys():
         if baselineAlg == 'BST':
             max_y = 3000
@@ -806,43 +838,33 @@ def plot_united_retries_scalability_bars(input_file_path, output_graph_path, war
             max_y = 3000
             jump = 500
 
-        datastructureAlgs = sorted(
-            [alg for alg in algs if baselineAlg in alg and "32" not in alg and "64" not in alg], key=lambda x: (len(x), x))
+        datastructureAlgs = algsByBaseline[baselineAlg]
         if datastructureAlgs == []:
             continue
+        path = output_graph_path % baselineAlg
+        if not needs_rebuild(input_file_path, path):
+            continue
         series = {}
         rects = {}
         for alg in datastructureAlgs:
-            series[alg] = []
-        for th in sizeThreads:
-            for alg in datastructureAlgs:
-                key = toString(alg, workloadThreadsNum, th,
-                               initSize, percentageRatio)
-                assert key in throughput
-                series[alg].append(throughput[key])
-
-        fig, axs = plt.subplots(figsize=(6.5, 4.2))
-        total_width = 1
+            keys = toStringBatch(alg, workloadThreadsNum, sizeThreads, initSize, percentageRatio)
+            assert all(key in throughput for key in keys)
+            series[alg] = [throughput[key] for key in keys]
+
+        reset_axes(axs)
         width = (total_width/len(datastructureAlgs))*0.75
-        x = np.arange(len(sizeThreads))
-        to_add = (len(datastructureAlgs)//2)*(-width)
+        positions = x + ((np.arange(len(datastructureAlgs)) - len(datastructureAlgs)//2) * width)[:, np.newaxis]
 
         _colors = ['C5', 'C6', 'C7', 'C8', 'C9', 'C10', 'C11']
-        ci = 0
+        labels = {}
 
-        for alg in datastructureAlgs:
-            rects[alg] = axs.bar(x+to_add, series[alg],
+        for ci, (alg, algPositions) in enumerate(zip(datastructureAlgs, positions)):
+            rects[alg] = axs.bar(algPositions, series[alg],
                                  width, label=alg, color=_colors[ci])
-            for i in range(len(sizeThreads)):
-                roundedValue = round(series[alg][i])
-                textSpace = max_y/50
-                axs.text((x+to_add)[i], series[alg][i] + textSpace, roundedValue,
-                         ha='center', va='bottom', rotation=90, fontsize=7)
-            to_add += width
-            ci += 1
+            labels[alg] = [round(value) for value in series[alg]]
         axs.set_xticks(x)
         axs.set_xticklabels(sizeThreads)
-        plt.tick_params(axis='x', bottom=True, top=False,
+        axs.tick_params(axis='x', bottom=True, top=False,
                         labelbottom=True, labeltop=False)
         ylabel = 'Size threads total TP (Kop/s)'
         xlabel = 'Size threads'
@@ -850,22 +872,27 @@ def plot_united_retries_scalability_bars(input_file_path, output_graph_path, war
         axs.set(ylabel=ylabel)
         axs.set_ylim(top=max_y)
         axs.set_ylim(bottom=0)
+        label_bars(axs, rects, labels, max_y/50)
         axs.spines['right'].set_visible(False)
         axs.spines['left'].set_visible(False)
         axs.spines['top'].set_visible(False)
         axs.set_axisbelow(True)
-        yLineValue = jump
-        while yLineValue <= max_y:
-            plt.axhline(y=yLineValue, linewidth=0.5, alpha=0.5,
-                        color='k', linestyle='--' if yLineValue != 0 else '-')
-            yLineValue += jump
-        path = output_graph_path % (baselineAlg)
-        plt.savefig(path, bbox_inches='tight', dpi=300)
-        plt.close('all')
+        draw_horizontal_lines(axs, np.arange(jump, max_y + 1, jump), linewidth=0.5, alpha=0.5, linestyle='--')
+        fig.savefig(path, bbox_inches='tight', dpi=FIG_DPI, pil_kwargs=PNG_PIL_KWARGS)
+    plt.close(fig)
+
+# (filename, labels) of the legend images saved by this process. The labels depend on which
+# algorithms a results file holds, so a legend is only skipped when the same entries were already
+# saved to the same file.
+_legend_written = set()
 
 def export_legend(legend, filename):
-    """Save legend to a standalone image file."""
+    """Save legend to a standalone image file, unless the same legend was already saved there."""
+    key = (filename, tuple(text.get_text() for text in legend.get_texts()))
+    if key in _legend_written:
+        return
+    _legend_written.add(key)
     fig = legend.figure
     fig.canvas.draw()
     bbox = legend.get_window_extent().transformed(fig.dpi_scale_trans.inverted())
-    fig.savefig(filename, dpi=300, bbox_inches=bbox)
\ No newline at end of file
+    fig.savefig(filename, dpi=FIG_DPI, bbox_inches=bbox, pil_kwargs=PNG_PIL_KWARGS)
\ No newline at end of file
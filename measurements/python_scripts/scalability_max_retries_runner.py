@@ -4,7 +4,7 @@ from pathlib import Path
 
 import plot_utils as graph
 import experiments_environment as env
-from experiment_utils import clear_previous_results, concat_results, java_cmd, parse_int_list
+from experiment_utils import clear_previous_results, concat_results, ensure_graph_dirs, java_cmd, parse_int_list, run_commands
 
 parser = argparse.ArgumentParser(
     description="Run scalability experiments for optimistic retries."
@@ -44,7 +44,11 @@ def delete_previous_results() -> None:
     clear_previous_results()
 
 def run_experiments() -> None:
-    cmd_base = java_cmd(jvm_mem)
+    # Arguments shared by all runs
+    leading_args = java_cmd(jvm_mem) + [workload_threads]
+    run_args = [str(total_runs), run_time, size_delay]
+    workload_args = [f"-ins{insert_rate}", f"-del{delete_rate}", f"-initSize{init_size}"]
+    cmds = []
     i = 0
     for ds in env.dataStructures:
         if "Optimistic" not in ds:
@@ -52,20 +56,17 @@ def run_experiments() -> None:
         for retry in retry_list:
             for size_threads in size_threads_list:
                 i += 1
-                cmd = (
-                    f"{cmd_base}{workload_threads} {size_threads} {total_runs} {run_time} {size_delay} {ds} "
-                    f"-ins{insert_rate} -del{delete_rate} -initSize{init_size} -retry-{retry} -prefill -file-build/data-trials{i}.csv"
-                )
-                if os.system(cmd) != 0:
-                    exit(1)
+                cmds.append(leading_args + [str(size_threads)] + run_args + [ds] + workload_args
+                            + [f"-retry-{retry}", "-prefill", f"-file-build/data-trials{i}.csv"])
+
+    if not run_commands(cmds):
+        exit(1)
 
 def create_united_results_file() -> None:
     concat_results(Path(results_file_path))
 
 def draw_graphs():
-    os.makedirs(env.GRAPH_DIR, exist_ok=True)
-    for alg in env.baselineDataStructures:
-        os.makedirs(os.path.join(env.GRAPH_DIR,alg), exist_ok=True)
+    ensure_graph_dirs()
 
 
     united_graph_file_path = os.path.join(env.GRAPH_DIR, "%s" , graph_name + "_united_%s_" + benchmark_name + ".png")
@@ -79,7 +80,11 @@ benchmark_name = (
 )
 results_file_path = os.path.join(env.DATA_DIR, f"{graph_name}_{benchmark_name}.csv")
 
-delete_previous_results()
-run_experiments()
-create_united_results_file()
-draw_graphs()
\ No newline at end of file
+def main():
+    delete_previous_results()
+    run_experiments()
+    create_united_results_file()
+    draw_graphs()
+
+if __name__ == "__main__":
+    main()
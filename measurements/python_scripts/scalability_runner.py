@@ -1,10 +1,11 @@
 import os
 import argparse
+import shlex
 from pathlib import Path
 
 import plot_utils as graph
 import experiments_environment as env
-from experiment_utils import clear_previous_results, concat_results, java_cmd, parse_int_list
+from experiment_utils import clear_previous_results, concat_results, ensure_graph_dirs, java_cmd, parse_int_list, run_commands
 
 parser = argparse.ArgumentParser(
     description="Run scalability experiments and optionally draw graphs."
@@ -19,6 +20,32 @@ parser.add_argument("--warmup-runs", type=int, required=True, help="Number of wa
 parser.add_argument("--repeats", type=int, required=True, help="Number of measured repetitions")
 parser.add_argument("--runtime", required=True, help="Benchmark runtime per repetition")
 parser.add_argument("--jvm-mem", required=True, help="JVM memory size (e.g., 1G)")
+parser.add_argument(
+    "--parallel-jobs",
+    type=int,
+    default=1,
+    help="Number of benchmark runs to execute concurrently (keep 1 when measuring throughput)",
+)
+parser.add_argument(
+    "--cpu-pin",
+    action="store_true",
+    help="Pin each concurrent run to its own set of cores with taskset",
+)
+parser.add_argument(
+    "--shell",
+    action="store_true",
+    help="Run each benchmark command through /bin/sh (for debugging)",
+)
+parser.add_argument(
+    "--scratch-dir",
+    default="build",
+    help="Directory for the per-run CSV files, e.g. a tmpfs such as /dev/shm/<run-id> (default: build)",
+)
+parser.add_argument(
+    "--discard-warmup",
+    action="store_true",
+    help="Have the benchmark leave the warm-up repetitions out of the results file",
+)
 # Experiments always run before graphs are drawn
 
 args = parser.parse_args()
@@ -30,39 +57,59 @@ if insert_rate + delete_rate > 100:
 
 init_size = args.init_size
 workload_threads = str(args.workload_threads)
-size_threads_list = args.size_threads_list
+size_threads_list = tuple(args.size_threads_list)
+if not size_threads_list:
+    parser.error("size-threads-list must contain at least one value")
 size_delay = str(args.size_delay)
 warmup_runs = args.warmup_runs
 total_runs = warmup_runs + args.repeats
 run_time = args.runtime
 jvm_mem = args.jvm_mem
+parallel_jobs = args.parallel_jobs
+cpu_pin = args.cpu_pin
+if cpu_pin and parallel_jobs <= 1:
+    parser.error("cpu-pin requires parallel-jobs greater than 1")
+if cpu_pin and not hasattr(os, "sched_getaffinity"):
+    parser.error("cpu-pin is not supported on this platform (no os.sched_getaffinity)")
+use_shell = args.shell
+scratch_dir = args.scratch_dir
+if os.path.realpath(scratch_dir) == os.path.realpath(env.DATA_DIR):
+    parser.error(f"scratch-dir must not be the results directory ({env.DATA_DIR})")
+discard_warmup = args.discard_warmup
 
 def delete_previous_results() -> None:
-    clear_previous_results()
+    os.makedirs(scratch_dir, exist_ok=True)
+    clear_previous_results(scratch_dir)
 
 def run_experiments() -> None:
-    cmd_base = java_cmd(jvm_mem)
+    # Arguments shared by all runs; each data structure sweeps all size thread counts inside a single JVM
+    leading_args = java_cmd(jvm_mem) + [
+        workload_threads, str(size_threads_list[0]), str(total_runs), run_time, size_delay,
+    ]
+    trailing_args = [
+        f"-ins{insert_rate}", f"-del{delete_rate}", f"-initSize{init_size}",
+        "-sizeThreadsList=" + ",".join(map(str, size_threads_list)), "-prefill",
+    ]
+    if discard_warmup:
+        trailing_args.append(f"-discardWarmup-{warmup_runs}")
 
+    cmds = []
     i = 0
     for ds in env.dataStructures:
-        if ds in env.baselineDataStructures:
+        if ds in env.baselineDataStructuresSet:
             continue
-        for size_threads in size_threads_list:
-            i += 1
-            cmd = (
-                f"{cmd_base}{workload_threads} {size_threads} {total_runs} {run_time} {size_delay} "
-                f"{ds} -ins{insert_rate} -del{delete_rate} -initSize{init_size} -prefill -file-build/data-trials{i}.csv"
-            )
-            if os.system(cmd) != 0:
-                exit(1)
+        i += 1
+        cmd = leading_args + [ds] + trailing_args + ["-file-" + os.path.join(scratch_dir, f"data-trials{i}.csv")]
+        cmds.append(shlex.join(cmd) if use_shell else cmd)
+
+    if not run_commands(cmds, parallel_jobs, cpu_pin, shell=use_shell):
+        exit(1)
 
 def create_united_results_file() -> None:
-    concat_results(Path(results_file_path))
+    concat_results(Path(results_file_path), Path(scratch_dir))
 
 def draw_graphs():
-    os.makedirs(env.GRAPH_DIR, exist_ok=True)
-    for alg in env.baselineDataStructures:
-        os.makedirs(os.path.join(env.GRAPH_DIR,alg), exist_ok=True)
+    ensure_graph_dirs()
     graph.plot_scalability_graph(results_file_path,
                                  os.path.join(env.GRAPH_DIR, "%s" , graph_name + "_sizeThreads_" + benchmark_name + ".png"),
                                  warmup_runs)
@@ -73,7 +120,11 @@ benchmark_name = (
 )
 results_file_path = os.path.join(env.DATA_DIR, f"{graph_name}_{benchmark_name}.csv")
 
-delete_previous_results()
-run_experiments()
-create_united_results_file()
-draw_graphs()
\ No newline at end of file
+def main():
+    delete_previous_results()
+    run_experiments()
+    create_united_results_file()
+    draw_graphs()
+
+if __name__ == "__main__":
+    main()